@@ -1,6 +1,29 @@
+import json
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-import altair as alt
+
+from components import engine
+from components.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, cache_key
+from components.charts import RANKING_MAX, SpecCache, binned_trend, choose_granularity, composition_chart, ranking_chart, trend_chart
+from components.detail import PAGE_SIZE, candidate_positions, page_count, page_positions, sort_permutation, top_k
+from components.engine import load_excel_metas
+from components.export import EXPORT_FORMATS, XLSX_AVISO, export_columns, export_file, file_name, report_tables
+from components.jobs import DEFAULT_WORKERS, JobManager, report_stage
+from components.memo import Memo
+from components.metas import MetasIndex, daily_team_goals, team_goal_summary
+from components.metrics import group_columns
+from components.outliers import MAD_Z
+from components.profiler import HISTORICO, RerunProfiler, chrome_trace
+from components.queries import DEFAULT_BACKEND
+from components.store import Dataset, build_dataset
+from components.watch import DirectoryWatcher, WatchedFile
+from shared import fmt_dec_br, fmt_int_br, get_store, inject_css, kpi_card, safe_unique, session_id
 
 # Comentario: Configuración general
 st.set_page_config(page_title="Dashboard Produção (m²) — SLN RDT", layout="wide")
@@ -8,298 +31,163 @@ st.set_page_config(page_title="Dashboard Produção (m²) — SLN RDT", layout="
 # =========================
 # CSS (estilo “dashboard product”)
 # =========================
-st.markdown("""
-<style>
-:root{
-  --bg:#f4f6fb;
-  --card:#ffffff;
-  --muted:#6b7280;
-  --text:#0f172a;
-  --border:#e8edf5;
-  --shadow: 0 8px 22px rgba(15, 23, 42, 0.06);
-  --radius:16px;
-  --blue:#2563eb;
-  --green:#10b981;
-  --red:#ef4444;
-}
-
-.stApp{ background: var(--bg); }
-.block-container{ padding-top: 1.0rem; padding-bottom: 2rem; max-width: 1400px; }
-
-section[data-testid="stSidebar"]{
-  background:#ffffff;
-  border-right:1px solid var(--border);
-}
-
-header[data-testid="stHeader"]{ background: transparent; }
-
-.card{
-  background: var(--card);
-  border: 1px solid var(--border);
-  border-radius: var(--radius);
-  box-shadow: var(--shadow);
-  padding: 14px 14px;
-}
-
-.section-title{
-  font-weight: 900;
-  color: var(--text);
-  letter-spacing: .2px;
-  font-size: 16px;
-  margin: 0 0 8px 0;
-}
-.section-sub{
-  color: var(--muted);
-  font-size: 12px;
-  margin: -4px 0 10px 0;
-}
-
-.topbar{
-  display:flex;
-  align-items:center;
-  justify-content:space-between;
-  gap:12px;
-  margin-bottom: 12px;
-}
-.brand{
-  display:flex;
-  align-items:center;
-  gap:10px;
-}
-.brand .pill{
-  background:#e9efff;
-  color:#1d4ed8;
-  border:1px solid #dbe7ff;
-  padding: 2px 10px;
-  border-radius: 999px;
-  font-size: 12px;
-  font-weight: 800;
-}
-.clock{ color: var(--muted); font-size: 12px; }
-.live{
-  display:inline-flex;
-  align-items:center;
-  gap:6px;
-  color:#059669;
-  font-size: 12px;
-  font-weight: 800;
-}
-.dot{ width:8px; height:8px; border-radius:999px; background:#10b981; display:inline-block; }
-
-.alert{
-  background: #fee2e2;
-  border: 1px solid #fecaca;
-  color: #991b1b;
-  border-radius: var(--radius);
-  box-shadow: var(--shadow);
-  padding: 14px;
-  display:flex;
-  align-items:center;
-  justify-content:space-between;
-  margin-bottom: 12px;
-}
-.alert strong{ font-weight: 900; }
-.alert small{ color:#7f1d1d; display:block; margin-top:4px; }
-
-.kpi{
-  background: var(--card);
-  border: 1px solid var(--border);
-  border-radius: var(--radius);
-  box-shadow: var(--shadow);
-  padding: 12px 12px;
-  display:flex;
-  align-items:center;
-  justify-content:space-between;
-  gap:10px;
-  min-height: 78px;
-}
-.kpi .left{ display:flex; gap:10px; align-items:center; }
-.icon{
-  width:34px; height:34px;
-  border-radius: 12px;
-  display:flex;
-  align-items:center;
-  justify-content:center;
-  font-weight:900;
-  color: var(--text);
-  background:#f1f5ff;
-  border:1px solid var(--border);
-}
-.kpi .label{ color: var(--muted); font-size: 12px; margin-bottom: 2px; }
-.kpi .value{ color: var(--text); font-size: 20px; font-weight: 950; letter-spacing: .2px; }
-
-.badge{
-  border-radius: 999px;
-  padding: 2px 10px;
-  font-size: 11px;
-  font-weight: 900;
-  border: 1px solid var(--border);
-  background:#f8fafc;
-  color: var(--muted);
-  white-space: nowrap;
-}
-.badge.red{ background:#fee2e2; border-color:#fecaca; color:#991b1b; }
-.badge.green{ background:#dcfce7; border-color:#bbf7d0; color:#166534; }
-.badge.blue{ background:#dbeafe; border-color:#bfdbfe; color:#1e40af; }
-</style>
-""", unsafe_allow_html=True)
-
-# =========================
-# Helpers
-# =========================
-def fmt_int_br(x: float) -> str:
-    # Comentario: Formato BR (1.234.567)
-    try:
-        return f"{float(x):,.0f}".replace(",", ".")
-    except Exception:
-        return "0"
-
-def safe_unique(df: pd.DataFrame, col: str) -> list:
-    # Comentario: Valores únicos sin NaN/vacío
-    if col not in df.columns:
-        return []
-    vals = df[col].dropna().astype(str).tolist()
-    vals = [v.strip() for v in vals if v.strip() != ""]
-    return sorted(list(set(vals)))
-
-def calc_m2(df: pd.DataFrame, km_ini: str, km_fim: str, largura: str) -> pd.Series:
-    # Comentario: m² = |Δkm| * 1000 * ancho(m)
-    ini = pd.to_numeric(df.get(km_ini), errors="coerce")
-    fim = pd.to_numeric(df.get(km_fim), errors="coerce")
-    lar = pd.to_numeric(df.get(largura), errors="coerce")
-    m2 = (fim - ini).abs() * 1000 * lar
-    return m2.fillna(0)
-
-def normalize_date_column(df: pd.DataFrame, col: str = "DATA") -> pd.DataFrame:
-    # Comentario: Normaliza DATA robustamente (texto / datetime / número Excel)
-    if col not in df.columns:
-        return df
-    s = df[col]
-    dt = pd.to_datetime(s, errors="coerce")
-    if dt.isna().any():
-        num = pd.to_numeric(s, errors="coerce")
-        dt2 = pd.to_datetime(num, unit="D", origin="1899-12-30", errors="coerce")
-        dt = dt.fillna(dt2)
-    df = df.copy()
-    df[col] = dt
-    df = df[df[col].notna()].copy()
-    df[col] = df[col].dt.date
-    return df
-
-def enrich_m2(df: pd.DataFrame) -> pd.DataFrame:
-    # Comentario: Calcula m² por frente y total
-    df = df.copy()
-    df["m2_manual"] = calc_m2(df, "KM INICIAL (Roçada Manual)", "KM FINAL (Roçada Manual)", "LARGURA (média) (Roçada Manual)")
-    df["m2_trator_a"] = calc_m2(df, "KM INICIAL (Trator A)", "KM FINAL (Trator A)", "LARGURA (média) (Trator A)")
-    df["m2_trator_b"] = calc_m2(df, "KM INICIAL (Trator B)", "KM FINAL (Trator B)", "LARGURA (média) (Trator B)")
-    df["m2_trator_c"] = calc_m2(df, "KM INICIAL (Trator C)", "KM FINAL (Trator C)", "LARGURA (média) (Trator C)")
-    df["m2_robo"] = calc_m2(df, "KM INICIAL (Robô)", "KM FINAL (Robô)", "LARGURA (média) (Robô)")
-    df["m2_tratores"] = df[["m2_trator_a", "m2_trator_b", "m2_trator_c"]].sum(axis=1)
-    df["m2_total"] = df[["m2_manual", "m2_tratores", "m2_robo"]].sum(axis=1)
-    return df
-
-def kpi_card(label: str, value: str, icon_text: str = "•", badge_text: str | None = None, badge_kind: str = "blue") -> str:
-    # Comentario: KPI en HTML para estética tipo producto
-    badge_html = ""
-    if badge_text is not None:
-        badge_html = f'<span class="badge {badge_kind}">{badge_text}</span>'
-    return f"""
-    <div class="kpi">
-      <div class="left">
-        <div class="icon">{icon_text}</div>
-        <div>
-          <div class="label">{label}</div>
-          <div class="value">{value}</div>
-        </div>
-      </div>
-      <div>{badge_html}</div>
-    </div>
-    """
+inject_css()
 
 # =========================
 # Loaders (Excel upload)
 # =========================
-@st.cache_data(ttl=3600)
-def load_excel_data(file_bytes: bytes, sheet_name: str) -> pd.DataFrame:
-    # Comentario: Lee el Excel de datos desde bytes (upload), normaliza y calcula m²
-    df = pd.read_excel(file_bytes, sheet_name=sheet_name)
-    df = normalize_date_column(df, "DATA")
-    df = enrich_m2(df)
-    return df
-
-@st.cache_data(ttl=3600)
-def load_excel_metas(file_bytes: bytes) -> pd.DataFrame:
-    # Comentario: Lee el Excel de metas (sheet: Metas)
-    df = pd.read_excel(file_bytes, sheet_name="Metas")
-
-    # Comentario: Limpieza mínima y tipado
-    needed = ["Nivel", "Referencia", "Metrica", "Periodo", "Meta"]
-    for c in needed:
-        if c not in df.columns:
-            raise ValueError(f"Coluna obrigatória ausente no Excel de metas: {c}")
-
-    df = df.dropna(subset=needed).copy()
-    df["Nivel"] = df["Nivel"].astype(str).str.strip()
-    df["Referencia"] = df["Referencia"].astype(str).str.strip()
-    df["Metrica"] = df["Metrica"].astype(str).str.strip()
-    df["Periodo"] = df["Periodo"].astype(str).str.strip()
-    df["Meta"] = pd.to_numeric(df["Meta"], errors="coerce")
-    df["Prioridade"] = pd.to_numeric(df.get("Prioridade", 99), errors="coerce").fillna(99).astype(int)
-
-    # Comentario: Fechas opcionales (validez)
-    if "Ativo de" in df.columns:
-        df["Ativo de"] = pd.to_datetime(df["Ativo de"], errors="coerce").dt.date
-    else:
-        df["Ativo de"] = pd.NaT
+# Comentario: Cache persistente (Parquet) — configurable vía secrets
+CACHE_DIR = st.secrets.get("CACHE_DIR", str(DEFAULT_CACHE_DIR))
+CACHE_MAX_BYTES = int(st.secrets.get("CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024))) * 1024 * 1024
 
-    if "Ativo até" in df.columns:
-        df["Ativo até"] = pd.to_datetime(df["Ativo até"], errors="coerce").dt.date
-    else:
-        df["Ativo até"] = pd.NaT
-
-    df = df[df["Meta"].notna()].copy()
-    return df
-
-def _metas_validas_no_periodo(df_metas: pd.DataFrame, d1, d2) -> pd.DataFrame:
-    # Comentario: Filtra metas por ventana de validez (si existe)
-    if df_metas is None or df_metas.empty:
-        return df_metas
-    df = df_metas.copy()
-    # Comentario: Si no hay fecha, consideramos válida
-    cond_ini = df["Ativo de"].isna() | (df["Ativo de"] <= d2)
-    cond_fim = df["Ativo até"].isna() | (df["Ativo até"] >= d1)
-    return df[cond_ini & cond_fim].copy()
-
-def resolve_meta_diaria_m2_total(df_metas: pd.DataFrame, contexto: dict, d1, d2) -> float | None:
-    """
-    Comentario: Devuelve la meta (Dia, m2_total) según jerarquía:
-    Equipe > Supervisor > Encarregado > Tipo > Geral
-    """
-    if df_metas is None or df_metas.empty:
-        return None
-
-    df = _metas_validas_no_periodo(df_metas, d1, d2)
-
-    # Comentario: Solo para este MVP: m2_total y Dia
-    df = df[(df["Metrica"] == "m2_total") & (df["Periodo"] == "Dia")].copy()
-    if df.empty:
-        return None
-
-    ordem = ["Equipe", "Supervisor", "Encarregado", "Tipo", "Geral"]
-    for nivel in ordem:
-        if nivel == "Geral":
-            ref = "ALL"
-        else:
-            ref = contexto.get(nivel)
+def load_excel_data(file_bytes: bytes, sheet_name: str, source: str = "") -> tuple[pd.DataFrame, bool]:
+    # Comentario: El motor (components/engine.py) con el cache configurado para el dashboard
+    return engine.load_excel_data(file_bytes, sheet_name, source, CACHE_DIR, CACHE_MAX_BYTES)
+
+# Comentario: Backend de las consultas del tablero: "pandas" (cubo en memoria) o "duckdb" (SQL en paralelo)
+QUERY_BACKEND = str(st.secrets.get("QUERY_BACKEND", DEFAULT_BACKEND)).lower()
+
+# Comentario: Pool de ingestión del proceso: el botón Processar solo encola el job
+INGEST_WORKERS = int(st.secrets.get("INGEST_WORKERS", DEFAULT_WORKERS))
 
-        if not ref:
-            continue
+@st.cache_resource
+def get_jobs() -> JobManager:
+    return JobManager(INGEST_WORKERS)
 
-        cand = df[(df["Nivel"] == nivel) & (df["Referencia"] == str(ref).strip())].copy()
-        if not cand.empty:
-            return float(cand.sort_values("Prioridade").iloc[0]["Meta"])
+# Comentario: Carpeta monitoreada (opcional): el export diario se reingiere solo al cambiar
+WATCH_DIR = st.secrets.get("WATCH_DIR", "")
+WATCH_SHEET = st.secrets.get("WATCH_SHEET", engine.DEFAULT_SHEET)
+WATCH_INTERVAL = int(st.secrets.get("WATCH_INTERVAL_S", 30))
+FONTES = ("Upload", "Pasta monitorada")
 
-    return None
+@st.cache_resource
+def get_watcher(diretorio: str) -> DirectoryWatcher:
+    return DirectoryWatcher(diretorio)
+
+# =========================
+# Perfil do rerun (opcional)
+# =========================
+# Comentario: Activado por secrets (PROFILING = true) o por la URL (?perfil=1)
+PROFILING = bool(st.secrets.get("PROFILING", False)) or st.query_params.get("perfil") == "1"
+perfis = st.session_state.setdefault("perfis", deque(maxlen=HISTORICO))
+prof = RerunProfiler(PROFILING, (perfis[-1].rerun + 1) if perfis else 1)
+if PROFILING:
+    perfis.append(prof)
+
+def fragment_profiler() -> RerunProfiler:
+    # Comentario: En el rerun de un fragmento el script no corre: el perfil del último rerun
+    # completo ya está cerrado y el fragmento registra el suyo en el historial
+    if not prof.fechado:
+        return prof
+    p = RerunProfiler(PROFILING, (perfis[-1].rerun + 1) if perfis else 1)
+    if PROFILING:
+        perfis.append(p)
+    return p
+
+def profile_panel() -> None:
+    # Comentario: Tabla del rerun actual + trace de los últimos reruns (chrome://tracing / Perfetto)
+    prof.close()
+    with st.sidebar.expander(f"⏱️ Perfil do rerun #{prof.rerun}", expanded=False):
+        st.dataframe(prof.table(), use_container_width=True, hide_index=True)
+        st.caption(f"Memo: {memo.hits} nó(s) reaproveitado(s), {memo.misses} recalculado(s).")
+        st.download_button("Exportar trace (Chrome JSON)", json.dumps(chrome_trace(list(perfis))),
+                           file_name="perfil_trace.json", mime="application/json")
+
+# =========================
+# Ingestão em segundo plano (jobs)
+# =========================
+store = get_store()
+jobs = get_jobs()
+sessao = session_id()
+
+def submit_ingest(read_bytes, sheet_name: str, source: str, metas_bytes: bytes | None,
+                  manter_metas: bool = False) -> str:
+    # Comentario: Encola la ingestión; `source` (nombre del upload o ruta) define el estado incremental
+    def ingest() -> dict:
+        # Comentario: Dados y metas se leen en paralelo; el error de metas no descarta los dados
+        fut_metas = jobs.parallel(load_excel_metas, metas_bytes) if metas_bytes is not None else None
+        file_bytes = read_bytes()
+        chave = cache_key(file_bytes, sheet_name)
+
+        def build() -> Dataset:
+            df_loaded, cache_hit = load_excel_data(file_bytes, sheet_name, source)
+            report_stage("indexando")
+            return build_dataset(chave, df_loaded, cache_hit, QUERY_BACKEND)
+
+        try:
+            _, compartida = store.acquire(chave, sessao, build)
+        except Exception as e:
+            raise RuntimeError(f"Erro ao ler o Excel/aba de dados. Verifique o nome da aba. Detalhe: {e}") from e
+        # Comentario: El job devuelve solo la clave: el Dataset vive únicamente en el registro
+        # (si el job lo retuviera, seguiría en memoria después de liberado por las sesiones)
+        out = {"chave": chave, "sessao": sessao, "compartida": compartida,
+               "manter_metas": manter_metas, "df_metas": None, "erro_metas": None}
+        if fut_metas is not None:
+            try:
+                out["df_metas"] = fut_metas.result()
+            except Exception as e:
+                out["erro_metas"] = f"Erro ao ler o Excel de metas (aba 'Metas'). Detalhe: {e}"
+        return out
+
+    return jobs.submit(Path(source).name, ingest).id
+
+def apply_ingest_result(res: dict) -> None:
+    # Comentario: La sesión guarda solo la clave de la base (los frames viven en el registro).
+    # Un job compartido (carpeta monitoreada) lo lanzó otra sesión: aquí se registra esta.
+    # Si la base ya se liberó (la otra sesión la soltó antes), la carpeta la vuelve a encolar.
+    if store.get(res["chave"], sessao) is None:
+        st.session_state.pop("watch_sha", None)
+        st.info("A base processada já foi liberada da memória; processando novamente.")
+        return
+
+    # Comentario: Caches por estado de filtros dependen de la base anterior
+    st.session_state.pop("memo", None)
+    st.session_state.pop("chart_specs", None)
+    anterior = st.session_state.get("dataset_key")
+    if anterior is not None and anterior != res["chave"]:
+        store.release(anterior, sessao)
+    st.session_state["dataset_key"] = res["chave"]
+    st.session_state["dataset_shared"] = res["compartida"] if res["sessao"] == sessao else True
+
+    # Comentario: Metas son opcionales (la recarga automática conserva las de la sesión)
+    if not res["manter_metas"]:
+        st.session_state["df_metas"] = res["df_metas"]
+        st.session_state["metas_idx"] = MetasIndex(res["df_metas"])
+    if res["erro_metas"]:
+        st.error(res["erro_metas"])
+
+def watch_job(arquivo: WatchedFile) -> str:
+    # Comentario: Un solo job por versión del archivo, aunque haya muchas sesiones mirando
+    watcher = get_watcher(WATCH_DIR)
+    job = jobs.get(watcher.jobs.get(arquivo.sha, ""))
+    # Comentario: Job terminado cuya base ya no está en el registro → se vuelve a ingerir
+    if job is None or job.erro or (job.done and not store.has(job.resultado["chave"])):
+        job_id = submit_ingest(arquivo.path.read_bytes, WATCH_SHEET, str(arquivo.path), None, manter_metas=True)
+        watcher.jobs[arquivo.sha] = job_id
+        return job_id
+    return job.id
+
+@st.fragment(run_every=WATCH_INTERVAL)
+def watch_source() -> None:
+    # Comentario: Cada WATCH_INTERVAL s: stat() de la carpeta; si el contenido cambió, reingesta en segundo plano
+    arquivo = get_watcher(WATCH_DIR).poll()
+    if arquivo is None:
+        st.caption(f"Nenhum .xlsx em {WATCH_DIR}.")
+        return
+    quando = pd.Timestamp(arquivo.mtime_ns, unit="ns", tz="UTC").tz_convert(None).strftime("%d/%m/%Y %H:%M")
+    st.caption(f"📂 {arquivo.path.name} · modificado em {quando} (UTC)")
+    if arquivo.sha != st.session_state.get("watch_sha") and "job_id" not in st.session_state:
+        st.session_state["watch_sha"] = arquivo.sha
+        st.session_state["job_id"] = watch_job(arquivo)
+        st.rerun()
+
+@st.fragment(run_every=1.0)
+def job_progress(job_id: str) -> None:
+    # Comentario: Solo este fragmento se re-ejecuta mientras el job corre; al terminar, rerun completo
+    job = jobs.get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progresso, text=f"{job.rotulo}… ({job.descricao})")
 
 # =========================
 # Sidebar: Acesso + Upload
@@ -314,8 +202,13 @@ with st.sidebar:
         st.stop()
 
     st.markdown("## Carregar dados")
-    up_data = st.file_uploader("Upload do Excel (dados) — .xlsx", type=["xlsx"], key="dados")
-    sheet_name = st.text_input("Nome da aba (dados)", value="Respostas ao formulário 1")
+    fonte = st.radio("Fonte", FONTES, index=1, horizontal=True) if WATCH_DIR else FONTES[0]
+    if fonte == FONTES[0]:
+        up_data = st.file_uploader("Upload do Excel (dados) — .xlsx", type=["xlsx"], key="dados")
+        sheet_name = st.text_input("Nome da aba (dados)", value=engine.DEFAULT_SHEET)
+    else:
+        up_data, sheet_name = None, WATCH_SHEET
+        watch_source()
 
     st.markdown("## Metas (opcional)")
     up_metas = st.file_uploader("Upload do Excel (metas) — .xlsx", type=["xlsx"], key="metas")
@@ -328,8 +221,15 @@ with st.sidebar:
 
     if limpar:
         st.cache_data.clear()
-        st.session_state.pop("df", None)
+        if "dataset_key" in st.session_state:
+            store.release(st.session_state.pop("dataset_key"), sessao)
+        st.session_state.pop("dataset_shared", None)
+        st.session_state.pop("job_id", None)
+        st.session_state.pop("watch_sha", None)
+        st.session_state.pop("memo", None)
+        st.session_state.pop("chart_specs", None)
         st.session_state.pop("df_metas", None)
+        st.session_state.pop("metas_idx", None)
         st.session_state.pop("meta", None)
         st.session_state.pop("meta_context", None)
 
@@ -337,33 +237,49 @@ with st.sidebar:
 # Processamento por botão
 # =========================
 if processar:
-    if up_data is None:
-        st.error("Faça upload do Excel de dados primeiro.")
-        st.stop()
-
-    try:
-        df_loaded = load_excel_data(up_data.getvalue(), sheet_name)
-    except Exception as e:
-        st.error(f"Erro ao ler o Excel/aba de dados. Verifique o nome da aba. Detalhe: {e}")
-        st.stop()
-
-    st.session_state["df"] = df_loaded
-
-    # Comentario: Metas son opcionales
-    if up_metas is not None:
-        try:
-            dfm = load_excel_metas(up_metas.getvalue())
-            st.session_state["df_metas"] = dfm
-        except Exception as e:
-            st.error(f"Erro ao ler o Excel de metas (aba 'Metas'). Detalhe: {e}")
+    metas_bytes = up_metas.getvalue() if up_metas is not None else None
+    if fonte == FONTES[0]:
+        if up_data is None:
+            st.error("Faça upload do Excel de dados primeiro.")
             st.stop()
+        file_bytes = up_data.getvalue()
+        st.session_state["job_id"] = submit_ingest(lambda: file_bytes, sheet_name, up_data.name, metas_bytes)
     else:
-        st.session_state["df_metas"] = None
+        arquivo = get_watcher(WATCH_DIR).poll()
+        if arquivo is None:
+            st.error(f"Nenhum .xlsx na pasta monitorada ({WATCH_DIR}).")
+            st.stop()
+        st.session_state["watch_sha"] = arquivo.sha
+        st.session_state["job_id"] = submit_ingest(arquivo.path.read_bytes, WATCH_SHEET, str(arquivo.path), metas_bytes)
+
+# =========================
+# Job de ingestão: progresso e troca da base
+# =========================
+if "job_id" in st.session_state:
+    job = jobs.get(st.session_state["job_id"])
+    if job is None:
+        st.session_state.pop("job_id")
+    elif job.done:
+        st.session_state.pop("job_id")
+        if job.erro:
+            st.error(job.erro)
+        else:
+            apply_ingest_result(job.resultado)
+            prof.add_job(job)
+    else:
+        with st.sidebar:
+            job_progress(job.id)
 
 # =========================
 # Estado: sem dados carregados
 # =========================
-if "df" not in st.session_state:
+ds = store.get(st.session_state["dataset_key"], sessao) if "dataset_key" in st.session_state else None
+if ds is None:
+    if "job_id" in st.session_state:
+        st.info("Processando a base em segundo plano — o painel aparece assim que terminar.")
+        st.stop()
+    if "dataset_key" in st.session_state:
+        st.info("A base desta sessão foi liberada da memória. Clique em Processar novamente.")
     st.markdown("""
     <div class="card">
       <div class="section-title">Como usar</div>
@@ -379,8 +295,15 @@ if "df" not in st.session_state:
     """, unsafe_allow_html=True)
     st.stop()
 
-df = st.session_state["df"]
+df = ds.df
+df_idx = ds.df_idx
+cube_idx = ds.cube_idx
+outlier_sketch = ds.outlier_sketch
+cube = cube_idx.df
 df_metas = st.session_state.get("df_metas", None)
+metas_idx = st.session_state.get("metas_idx")
+if metas_idx is None:
+    metas_idx = st.session_state["metas_idx"] = MetasIndex(df_metas)
 
 if df.empty:
     st.warning("A base carregada está vazia após normalização de DATA.")
@@ -390,14 +313,42 @@ if df.empty:
 # Sidebar filtros (depois do carregamento)
 # =========================
 with st.sidebar:
+    # Comentario: Indicador del cache de ingestión
+    if st.session_state.get("dataset_shared"):
+        st.markdown('<span class="badge green">⚡ Base compartilhada</span>', unsafe_allow_html=True)
+        st.caption("Base já carregada no servidor por outra sessão (sem nova cópia).")
+    elif ds.cache_hit:
+        st.markdown('<span class="badge green">⚡ Cache: hit</span>', unsafe_allow_html=True)
+        st.caption("Dados lidos do Parquet em disco (sem reprocessar o Excel).")
+    else:
+        st.markdown('<span class="badge blue">🐢 Cache: miss</span>', unsafe_allow_html=True)
+        ingestao = df.attrs.get("ingestao", {})
+        if ingestao.get("modo") == "incremental":
+            st.caption(f"Ingestão incremental: {ingestao.get('linhas_novas', 0)} linhas novas processadas.")
+        else:
+            st.caption("Excel processado e convertido para Parquet; próximas cargas serão rápidas.")
+    memoria = df.attrs.get("memoria")
+    if memoria:
+        antes, depois = (f"{memoria[k] / 1e6:.1f}".replace(".", ",") for k in ("antes", "depois"))
+        # Comentario: Solo la etapa de compactación (tipos/columnas de vista); el lector ya
+        # cargó únicamente las columnas usadas, así que "antes" no es el Excel completo
+        st.caption(f"Memória da base: {depois} MB (compactação de tipos: {antes} MB → {depois} MB).")
+    if ds.consultas.nome != QUERY_BACKEND:
+        st.caption(f"Backend de consultas '{QUERY_BACKEND}' indisponível; usando {ds.consultas.nome}.")
+    elif QUERY_BACKEND != DEFAULT_BACKEND:
+        st.caption(f"Consultas via {ds.consultas.nome}.")
+    uso = store.stats()
+    st.caption(f"No servidor: {uso['bases']} base(s) em memória para {uso['sessoes']} sessão(ões).")
+
     st.markdown("## Filtros")
-    dmin, dmax = min(df["DATA"]), max(df["DATA"])
+    # Comentario: DATA es datetime64 (ordenada en el índice); el widget trabaja con date
+    dmin, dmax = cube["DATA"].iloc[0].date(), cube["DATA"].iloc[-1].date()
     date_range = st.date_input("Período", value=(dmin, dmax), min_value=dmin, max_value=dmax)
     d1, d2 = date_range if isinstance(date_range, tuple) else (dmin, dmax)
 
-    equipes = safe_unique(df, "EQUIPE")
-    encarregados = safe_unique(df, "NOME DO ENCARREGADO")
-    supervisores = safe_unique(df, "SUPERVISOR")
+    equipes = safe_unique(cube, "EQUIPE")
+    encarregados = safe_unique(cube, "NOME DO ENCARREGADO")
+    supervisores = safe_unique(cube, "SUPERVISOR")
 
     sel_equipes = st.multiselect("Equipe", equipes, default=[])
     sel_enc = st.multiselect("Encarregado", encarregados, default=[])
@@ -406,15 +357,22 @@ with st.sidebar:
 # =========================
 # Apply filters
 # =========================
-df_f = df[(df["DATA"] >= d1) & (df["DATA"] <= d2)].copy()
-if sel_equipes and "EQUIPE" in df_f.columns:
-    df_f = df_f[df_f["EQUIPE"].astype(str).isin(sel_equipes)]
-if sel_enc and "NOME DO ENCARREGADO" in df_f.columns:
-    df_f = df_f[df_f["NOME DO ENCARREGADO"].astype(str).isin(sel_enc)]
-if sel_sup and "SUPERVISOR" in df_f.columns:
-    df_f = df_f[df_f["SUPERVISOR"].astype(str).isin(sel_sup)]
-
-if df_f.empty:
+# Comentario: KPIs, gráficos y outliers salen del cubo (y sus sketches); la base cruda solo para el detalle.
+# Los filtros usan el índice (slice por fecha + posiciones por categoría), sin copiar columnas.
+# Comentario: Nodos memoizados (components/memo.py): la clave de cada uno = base + filtros
+# (+ sus propias entradas); un rerun sin cambios aguas arriba no recalcula nada.
+memo = st.session_state.setdefault("memo", Memo())
+memo.reset_stats()
+selecoes = {"EQUIPE": sel_equipes, "NOME DO ENCARREGADO": sel_enc, "SUPERVISOR": sel_sup}
+filtro_key = (d1, d2, tuple(sel_equipes), tuple(sel_enc), tuple(sel_sup))
+no_filtro = (ds.chave, filtro_key)
+with prof.stage("filtros") as m:
+    cube_view, df_view = memo.get("filtros", no_filtro,
+                                  lambda: (cube_idx.select(d1, d2, selecoes), df_idx.select(d1, d2, selecoes)))
+    cube_f = cube_view.frame()
+    m.rows(len(df_view))
+
+if cube_f.empty:
     st.info("Sem dados para os filtros selecionados.")
     st.stop()
 
@@ -437,13 +395,18 @@ st.markdown(f"""
 # =========================
 # Alert banner (outliers como exemplo)
 # =========================
-outliers = int((df_f["m2_total"] > df_f["m2_total"].quantile(0.95)).sum())
+# Comentario: p95/MAD por equipe desde los sketches del cubo (cacheado por estado de filtros)
+with prof.stage("outliers") as m:
+    outlier_info = memo.get("outliers", no_filtro,
+                            lambda: {c: outlier_sketch.summary(cube_view, c) for c in outlier_sketch.colunas})
+    m.rows(len(cube_view))
+outliers = outlier_info["m2_total"]["outliers_p95"]
 if outliers > 0:
     st.markdown(f"""
     <div class="alert">
       <div>
         <strong>⚠️ {outliers} registros fora do padrão</strong>
-        <small>Acima do p95 de m² no período filtrado (alerta de consistência).</small>
+        <small>Acima do p95 de m² da própria equipe no período filtrado (alerta de consistência).</small>
       </div>
       <div style="opacity:.6;">✕</div>
     </div>
@@ -452,11 +415,21 @@ if outliers > 0:
 # =========================
 # KPIs principais
 # =========================
-m2_total = float(df_f["m2_total"].sum())
-dias = int(df_f["DATA"].nunique())
-m2_por_dia = (m2_total / dias) if dias else 0.0
-equipes_ativas = int(df_f["EQUIPE"].nunique()) if "EQUIPE" in df_f.columns else 0
-registros = int(len(df_f))
+# Comentario: KPIs / gráficos / qualidade salen del backend configurado (mismos resultados)
+consulta = ds.consultas.view(d1, d2, selecoes, cube_view)
+with prof.stage("kpis") as m:
+    kpi = memo.get("kpis", no_filtro, consulta.kpis)
+    m.rows(len(cube_f))
+m2_total = kpi["m2_total"]
+dias = kpi["dias"]
+m2_por_dia = kpi["m2_por_dia"]
+equipes_ativas = kpi["equipes_ativas"]
+registros = kpi["registros"]
+
+# Comentario: Cobertura KM (unión de tramos del filtro)
+with prof.stage("cobertura") as m:
+    cobertura = memo.get("cobertura", no_filtro, lambda: ds.segments.coverage(df_view))
+    m.rows(len(ds.segments))
 
 # =========================
 # Resolver meta (m²/dia para m2_total)
@@ -470,7 +443,9 @@ if len(sel_sup) == 1:
 if len(sel_enc) == 1:
     contexto["Encarregado"] = sel_enc[0]
 
-meta_diaria = resolve_meta_diaria_m2_total(df_metas, contexto, d1, d2)
+with prof.stage("meta"):
+    meta_diaria = memo.get("meta", (metas_idx, tuple(sorted(contexto.items())), d1, d2),
+                           lambda: metas_idx.resolve(contexto, d1, d2))
 
 # Badge da meta
 badge_meta_text = None
@@ -501,6 +476,22 @@ with k4:
 with k5:
     st.markdown(kpi_card("Registros", str(registros), "🧾"), unsafe_allow_html=True)
 
+# Comentario: Segunda fila: el m² total cuenta cada pasada; aquí, cuánto de la rodovia se cubrió de verdad
+pct_sobre = (cobertura.m2_sobreposto / m2_total * 100) if m2_total else 0.0
+k6, k7, k8, k9 = st.columns(4)
+with k6:
+    st.markdown(kpi_card("km cobertos (únicos)", fmt_dec_br(cobertura.km_unicos), "🛣️"), unsafe_allow_html=True)
+with k7:
+    st.markdown(kpi_card("km repassados", fmt_dec_br(cobertura.km_sobreposto), "🔁"), unsafe_allow_html=True)
+with k8:
+    st.markdown(kpi_card("m² sobreposto", fmt_int_br(cobertura.m2_sobreposto), "🧩",
+                         f"{fmt_dec_br(pct_sobre)}% do total", "red" if pct_sobre >= 10 else "blue"), unsafe_allow_html=True)
+with k9:
+    st.markdown(kpi_card("Lacunas (km)", fmt_dec_br(cobertura.km_lacunas), "🕳️"), unsafe_allow_html=True)
+if not cobertura.lacunas.empty:
+    maiores = " · ".join(f"km {fmt_dec_br(r.de, 3)}–{fmt_dec_br(r.ate, 3)}" for r in cobertura.lacunas.itertuples())
+    st.caption(f"Maiores lacunas entre o menor e o maior KM do período: {maiores}")
+
 # Mensagem rápida sobre contexto
 if meta_diaria is not None:
     if len(sel_equipes) != 1:
@@ -515,54 +506,30 @@ st.write("")
 # =========================
 c1, c2 = st.columns([1.35, 1])
 
+# Comentario: Specs cacheados por base + estado de filtros (y meta, que se dibuja en la tendencia)
+spec_cache = st.session_state.setdefault("chart_specs", SpecCache())
+freq, rotulo_bin = choose_granularity(d1, d2)
+
 with c1:
-    st.markdown('<div class="card"><div class="section-title">Tendência</div><div class="section-sub">m² por dia</div>', unsafe_allow_html=True)
-
-    trend = df_f.groupby("DATA", as_index=False)["m2_total"].sum().sort_values("DATA")
-
-    area = alt.Chart(trend).mark_area(
-        line={"color": "#2563eb", "strokeWidth": 3},
-        opacity=0.18
-    ).encode(
-        x=alt.X("DATA:T", title=None),
-        y=alt.Y("m2_total:Q", title=None),
-        tooltip=[
-            alt.Tooltip("DATA:T", title="Data"),
-            alt.Tooltip("m2_total:Q", title="m²", format=",.0f")
-        ]
-    )
-
-    layers = [area]
-
-    # Comentario: Línea de meta (si existe)
-    if meta_diaria is not None:
-        meta_line = alt.Chart(pd.DataFrame({"meta": [meta_diaria]})).mark_rule(
-            color="#ef4444", strokeWidth=2
-        ).encode(
-            y="meta:Q",
-            tooltip=[alt.Tooltip("meta:Q", title="Meta (m²/dia)", format=",.0f")]
-        )
-        layers.append(meta_line)
+    sub = "m² por dia" if rotulo_bin == "dia" else f"m² por dia (média por {rotulo_bin})"
+    st.markdown(f'<div class="card"><div class="section-title">Tendência</div><div class="section-sub">{sub}</div>', unsafe_allow_html=True)
 
-    st.altair_chart(alt.layer(*layers).properties(height=260), use_container_width=True)
+    with prof.stage("tendência", "grafico") as m:
+        spec = spec_cache.get(
+            ("tendencia", no_filtro, meta_diaria),
+            lambda: trend_chart(binned_trend(consulta.trend(), freq), meta_diaria, rotulo_bin),
+        )
+        st.vega_lite_chart(spec, use_container_width=True)
+        m.sent(spec)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with c2:
     st.markdown('<div class="card"><div class="section-title">Ranking</div><div class="section-sub">Top equipes por m²</div>', unsafe_allow_html=True)
 
-    rank = df_f.groupby("EQUIPE", as_index=False)["m2_total"].sum().sort_values("m2_total", ascending=False).head(10)
-    bar = alt.Chart(rank).mark_bar(
-        cornerRadiusTopRight=10, cornerRadiusBottomRight=10, color="#2563eb"
-    ).encode(
-        y=alt.Y("EQUIPE:N", sort="-x", title=None),
-        x=alt.X("m2_total:Q", title=None),
-        tooltip=[
-            alt.Tooltip("EQUIPE:N", title="Equipe"),
-            alt.Tooltip("m2_total:Q", title="m²", format=",.0f")
-        ]
-    ).properties(height=260)
-
-    st.altair_chart(bar, use_container_width=True)
+    with prof.stage("ranking", "grafico") as m:
+        spec = spec_cache.get(("ranking", no_filtro), lambda: ranking_chart(consulta.ranking(RANKING_MAX)))
+        st.vega_lite_chart(spec, use_container_width=True)
+        m.sent(spec)
     st.markdown("</div>", unsafe_allow_html=True)
 
 st.write("")
@@ -572,30 +539,33 @@ c3, c4 = st.columns([1, 1])
 with c3:
     st.markdown('<div class="card"><div class="section-title">Composição</div><div class="section-sub">Manual vs Tratores vs Robô</div>', unsafe_allow_html=True)
 
-    comp_df = pd.DataFrame({
-        "Tipo": ["Manual", "Tratores", "Robô"],
-        "m2": [float(df_f["m2_manual"].sum()), float(df_f["m2_tratores"].sum()), float(df_f["m2_robo"].sum())]
-    })
-
-    donut = alt.Chart(comp_df).mark_arc(innerRadius=70).encode(
-        theta=alt.Theta("m2:Q"),
-        color=alt.Color("Tipo:N", scale=alt.Scale(range=["#94a3b8", "#2563eb", "#10b981"]),
-                        legend=alt.Legend(title=None)),
-        tooltip=[
-            alt.Tooltip("Tipo:N", title="Tipo"),
-            alt.Tooltip("m2:Q", title="m²", format=",.0f")
-        ]
-    ).properties(height=260)
-
-    st.altair_chart(donut, use_container_width=True)
+    with prof.stage("composição", "grafico") as m:
+        spec = spec_cache.get(("composicao", no_filtro), lambda: composition_chart(consulta.composition()))
+        st.vega_lite_chart(spec, use_container_width=True)
+        m.sent(spec)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with c4:
     st.markdown('<div class="card"><div class="section-title">Qualidade</div><div class="section-sub">checagens rápidas</div>', unsafe_allow_html=True)
 
-    zero = int((df_f["m2_total"] <= 0).sum())
+    zero = kpi["registros_zero"]
     st.markdown(f"- **m² = 0**: {zero} registros")
-    st.markdown(f"- **Outliers** (p95): {outliers} registros")
+    with prof.stage("qualidade"):
+        totais_qc = memo.get("qualidade", no_filtro, consulta.quality_totals)
+    for rotulo, n in totais_qc.items():
+        if n:
+            st.markdown(f"- **{rotulo}**: {n} registros")
+    st.markdown(f"- **Outliers** (p95 da equipe): {outliers} registros")
+    st.markdown(f"- **Outliers** (MAD, |z| > {MAD_Z:g}): {outlier_info['m2_total']['outliers_mad']} registros")
+    por_frente = [f"{g}: {outlier_info[c]['outliers_p95']}" for g, c in group_columns().items() if c in outlier_info]
+    if por_frente:
+        st.caption("Acima do p95 da equipe, por frente (entre os registros que usaram a frente) — " + " · ".join(por_frente))
+    data_invalida = df.attrs.get("qualidade", {}).get("data_invalida", 0)
+    data_vazia = df.attrs.get("qualidade", {}).get("data_vazia", 0)
+    if data_invalida:
+        st.caption(f"{data_invalida} registros com DATA inválida foram descartados na carga (fora de qualquer filtro).")
+    if data_vazia:
+        st.caption(f"{data_vazia} registros sem DATA (célula vazia) foram ignorados na carga.")
 
     st.markdown("<br>", unsafe_allow_html=True)
     if meta_diaria is None:
@@ -614,26 +584,113 @@ with c4:
 st.write("")
 
 # =========================
-# Detail table (card)
+# Metas por equipe (card)
 # =========================
-st.markdown('<div class="card"><div class="section-title">Detalhe</div><div class="section-sub">registros filtrados (ordenados por m²)</div>', unsafe_allow_html=True)
+if metas_idx:
+    st.markdown('<div class="card"><div class="section-title">Metas por equipe</div><div class="section-sub">meta diária aplicada a cada (dia, equipe) do período filtrado</div>', unsafe_allow_html=True)
+
+    def metas_por_equipe() -> tuple[int, pd.DataFrame]:
+        pares_meta = daily_team_goals(cube_f, df_metas)
+        return len(pares_meta), team_goal_summary(pares_meta)
+
+    with prof.stage("metas por equipe", "grafico") as m:
+        n_pares, resumo_meta = memo.get("metas_equipe", (no_filtro, metas_idx), metas_por_equipe)
+        m.rows(n_pares)
+        if resumo_meta.empty:
+            st.markdown("Nenhuma meta vigente para as equipes/dias filtrados.")
+        else:
+            st.dataframe(resumo_meta, use_container_width=True, hide_index=True)
+            m.sent(resumo_meta)
 
-cols = [c for c in ["DATA", "SUPERVISOR", "NOME DO ENCARREGADO", "EQUIPE", "m2_total", "m2_manual", "m2_tratores", "m2_robo"] if c in df_f.columns]
-df_show = df_f[cols].copy().sort_values("m2_total", ascending=False)
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.write("")
 
-a, b = st.columns([1, 1])
-with a:
-    show_all = st.checkbox("Mostrar todas as linhas", value=False)
-with b:
-    only_zero = st.checkbox("Somente m² = 0 (checagem)", value=False)
+# =========================
+# Detail table (card)
+# =========================
+st.markdown('<div class="card"><div class="section-title">Detalhe</div><div class="section-sub">registros filtrados (ordenados por m²)</div>', unsafe_allow_html=True)
 
-if only_zero:
-    df_show = df_show[df_show["m2_total"] <= 0]
-if not show_all:
-    df_show = df_show.head(500)
+@st.fragment
+def detail_table(df_view, no_filtro: tuple, cols: list[str]) -> None:
+    # Comentario: Fragmento: los checkboxes y la página re-ejecutan solo esta tabla
+    # (sin CSS, filtros, gráficos ni metas); las posiciones salen del memo de la sesión.
+    p = fragment_profiler()
+    a, b = st.columns([1, 1])
+    with a:
+        show_all = st.checkbox("Mostrar todas as linhas", value=False)
+    with b:
+        only_zero = st.checkbox("Somente m² = 0 (checagem)", value=False)
+
+    # Comentario: Nunca se envía más de PAGE_SIZE filas al navegador.
+    # Vista por defecto = top-k (argpartition); "todas" = páginas sobre una permutación
+    # memoizada por estado de filtros.
+    with p.stage("detalhe", "grafico") as m:
+        det_pos, det_vals = memo.get("detalhe", (no_filtro, only_zero), lambda: candidate_positions(df_view, only_zero))
+        n_det = len(det_pos)
+        m.rows(n_det)
+        if not show_all:
+            page = 0
+            order = memo.get("detalhe_topk", (no_filtro, only_zero),
+                             lambda: top_k(det_vals, min(PAGE_SIZE, n_det)) if n_det else np.empty(0, dtype="int64"))
+        else:
+            order = memo.get("detalhe_ordem", (no_filtro, only_zero), lambda: sort_permutation(det_vals))
+            n_pages = page_count(n_det)
+            # Comentario: key por estado de filtros → la página vuelve a 1 cuando cambia el filtro
+            page = int(st.number_input(f"Página (de {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+                                       key=f"detail_page_{hash((no_filtro, only_zero))}")) - 1
+
+        df_show = df_view.take(page_positions(det_pos, order, page), cols)
+        if n_det:
+            ini = page * PAGE_SIZE + 1
+            st.caption(f"Mostrando {ini}–{ini + len(df_show) - 1} de {n_det} registros.")
+
+        st.dataframe(df_show, use_container_width=True, hide_index=True,
+                     column_config={"DATA": st.column_config.DateColumn("DATA", format="DD/MM/YYYY")})
+        m.sent(df_show)
+    if p is not prof:
+        p.close()
+
+cols = [c for c in ["DATA", "SUPERVISOR", "NOME DO ENCARREGADO", "EQUIPE", "m2_total", "m2_manual", "m2_tratores", "m2_robo"] if c in df.columns]
+detail_table(df_view, no_filtro, cols)
 
-st.dataframe(df_show, use_container_width=True, hide_index=True)
+st.markdown("</div>", unsafe_allow_html=True)
 
+# =========================
+# Exportação (card)
+# =========================
+def gerar_export(formato: str, df_view, relatorio: Callable[[], dict[str, pd.DataFrame]]) -> bytes:
+    # Comentario: Se escribe en un archivo temporal en disco, chunk a chunk. download_button
+    # no hace streaming: guarda el archivo terminado en memoria para servirlo, así que se le
+    # entregan los bytes leídos una sola vez (un BytesIO sumaría una segunda copia con getvalue)
+    with tempfile.TemporaryFile() as tmp:
+        export_file(formato, df_view, export_columns(df_idx.df), relatorio(), tmp)
+        tmp.seek(0)
+        return tmp.read()
+
+@st.fragment
+def export_panel(df_view, relatorio: Callable[[], dict[str, pd.DataFrame]], nome: Callable[[str], str]) -> None:
+    # Comentario: El archivo se arma recién al hacer clic, en el thread de la descarga
+    # (data=callable); cambiar el formato re-ejecuta solo este bloque
+    formato = st.radio("Formato", list(EXPORT_FORMATS), horizontal=True, key="export_formato",
+                       format_func=lambda f: {"csv": "CSV (.zip)", "parquet": "Parquet (.zip)", "xlsx": "Excel (.xlsx)"}[f])
+    st.download_button(f"Exportar {fmt_int_br(len(df_view))} registros + agregados",
+                       lambda: gerar_export(formato, df_view, relatorio),
+                       file_name=nome(formato), mime=EXPORT_FORMATS[formato][1], on_click="ignore")
+    if formato == "xlsx" and len(df_view) > XLSX_AVISO:
+        st.caption("Excel é bem mais lento que CSV/Parquet para bases grandes.")
+
+st.markdown('<div class="card"><div class="section-title">Exportação</div><div class="section-sub">registros filtrados + KPIs, tendência, ranking, composição e metas</div>', unsafe_allow_html=True)
+# Comentario: Mismo estado del tablero: la vista de filtros, los KPIs/cobertura/meta ya calculados
+# y las consultas del backend sobre la misma selección
+export_panel(
+    df_view,
+    lambda: report_tables(kpi, cobertura, consulta.trend(), consulta.ranking(max(equipes_ativas, 1)),
+                          consulta.composition(), meta_diaria, resumo_meta if metas_idx else None),
+    lambda formato: file_name(formato, d1, d2),
+)
 st.markdown("</div>", unsafe_allow_html=True)
 
 st.caption("Nota: m² = |KM FINAL − KM INICIAL| × 1000 × LARGURA(m). Linhas incompletas tendem a gerar m²=0.")
+
+if PROFILING:
+    profile_panel()
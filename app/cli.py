@@ -0,0 +1,110 @@
+"""
+Processamento em lote (sem Streamlit): KPIs, ranking por equipe e atingimento de metas
+de vários Excel de respostas, em paralelo (um processo por arquivo).
+
+Uso:
+    python app/cli.py dados/*.xlsx --metas metas.xlsx --out saida/ [--format parquet|csv]
+                      [--sheet "Respostas ao formulário 1"] [--de 2024-01-01 --ate 2024-01-31]
+                      [--workers N] [--cache-dir .cache/ingest]
+
+Saída (uma tabela por tipo, com a coluna `arquivo`):
+    kpis, ranking, cobertura_equipe, metas_diarias, metas_equipe (.parquet ou .csv)
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from components.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from components.engine import DEFAULT_SHEET, load_excel_data, load_excel_metas, summarize
+
+TABELAS = ("kpis", "ranking", "cobertura_equipe", "metas_diarias", "metas_equipe")
+
+
+def process_workbook(path: str, sheet_name: str, metas_bytes: bytes | None, d1, d2,
+                     cache_dir: str, max_bytes: int) -> dict[str, pd.DataFrame]:
+    # Comentario: Corre en un proceso del pool: lee (o toma del cache) y resume un Excel
+    file_bytes = Path(path).read_bytes()
+    df, _ = load_excel_data(file_bytes, sheet_name, str(Path(path).resolve()), cache_dir, max_bytes)
+    df_metas = load_excel_metas(metas_bytes) if metas_bytes is not None else None
+    out = summarize(df, df_metas, d1, d2)
+    for t in out.values():
+        t.insert(0, "arquivo", Path(path).name)
+    return out
+
+
+def _expand(padroes: list[str]) -> list[str]:
+    # Comentario: Globs expandidos también en Windows (el shell no lo hace)
+    arquivos = []
+    for p in padroes:
+        arquivos.extend(sorted(glob.glob(p)) or [p])
+    return list(dict.fromkeys(arquivos))
+
+
+def _write(df: pd.DataFrame, path: Path, formato: str) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    if formato == "parquet":
+        # Comentario: Categóricas / objetos mixtos → texto (Parquet exige un tipo por columna)
+        df = df.astype({c: str for c in df.columns if df[c].dtype == object or isinstance(df[c].dtype, pd.CategoricalDtype)})
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="KPIs de produção (m²) em lote")
+    ap.add_argument("arquivos", nargs="+", help="Excel(s) de respostas (aceita globs)")
+    ap.add_argument("--sheet", default=DEFAULT_SHEET)
+    ap.add_argument("--metas", help="Excel de metas (aba Metas)")
+    ap.add_argument("--out", default="saida")
+    ap.add_argument("--format", choices=("parquet", "csv"), default="parquet")
+    ap.add_argument("--de", type=lambda v: pd.Timestamp(v).date(), help="início do período (AAAA-MM-DD)")
+    ap.add_argument("--ate", type=lambda v: pd.Timestamp(v).date(), help="fim do período (AAAA-MM-DD)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    ap.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    args = ap.parse_args(argv)
+
+    arquivos = _expand(args.arquivos)
+    metas_bytes = Path(args.metas).read_bytes() if args.metas else None
+    max_bytes = args.cache_max_mb * 1024 * 1024
+    partes: dict[str, list[pd.DataFrame]] = {t: [] for t in TABELAS}
+    erros = 0
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(arquivos)))) as pool:
+        futs = {
+            pool.submit(process_workbook, a, args.sheet, metas_bytes, args.de, args.ate, args.cache_dir, max_bytes): a
+            for a in arquivos
+        }
+        for fut in as_completed(futs):
+            try:
+                res = fut.result()
+            except Exception as e:
+                erros += 1
+                print(f"ERRO {futs[fut]}: {e}", file=sys.stderr)
+                continue
+            for t in TABELAS:
+                partes[t].append(res[t])
+            print(f"ok   {futs[fut]}", file=sys.stderr)
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for t in TABELAS:
+        validas = [p for p in partes[t] if not p.empty]
+        if not validas:
+            continue
+        df = pd.concat(validas, ignore_index=True).sort_values("arquivo", kind="stable")
+        _write(df, out / f"{t}.{args.format}", args.format)
+    print(f"{len(arquivos) - erros}/{len(arquivos)} arquivos em {time.perf_counter() - t0:.1f}s → {out}", file=sys.stderr)
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
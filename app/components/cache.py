@@ -0,0 +1,128 @@
+# Cache de ingestión en disco (Parquet)
+import datetime as _dt
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Comentario: Subir la versión invalida los archivos generados con otro pipeline
+CACHE_VERSION = "6"
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "ingest"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ATTRS_KEY = b"sln_attrs"
+_STATE_KEY = b"sln_state"
+
+
+def cache_key(file_bytes: bytes, sheet_name: str) -> str:
+    # Comentario: Hash del contenido + aba + versión del pipeline
+    h = hashlib.sha256()
+    h.update(CACHE_VERSION.encode())
+    h.update(b"\0")
+    h.update(sheet_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(file_bytes)
+    return h.hexdigest()
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: Parquet exige nombres str y columnas de tipo único (Excel mezcla texto y número)
+    df = df.rename(columns=str)
+    for col in df.columns:
+        s = df[col]
+        if s.dtype != object:
+            continue
+        tipos = set(map(type, s.dropna()))
+        if len(tipos) > 1 or (tipos and not tipos <= {str, _dt.date}):
+            df[col] = s.where(s.isna(), s.astype(str))
+    return df
+
+
+def write_frame(path: Path, df: pd.DataFrame, state: dict | None = None) -> None:
+    """
+    Comentario: Escritura atómica (tmp + replace) para no dejar archivos a medias. `state`
+    va en la metadata del esquema, en el mismo archivo que los datos (se leen juntos o
+    no se leen). El tmp es único por escritura: varios threads del mismo proceso pueden
+    escribir la misma ruta a la vez (gana el último replace, nunca una mezcla).
+    """
+    df = _arrow_safe(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[_ATTRS_KEY] = json.dumps(df.attrs, default=str).encode("utf-8")
+    if state is not None:
+        meta[_STATE_KEY] = json.dumps(state).encode("utf-8")
+    table = table.replace_schema_metadata(meta)
+    tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    # Comentario: Lectura con memory-map (sin volver a parsear el Excel)
+    table = pq.read_table(path, memory_map=True)
+    df = table.to_pandas()
+    raw = (table.schema.metadata or {}).get(_ATTRS_KEY)
+    if raw:
+        df.attrs.update(json.loads(raw.decode("utf-8")))
+    return df
+
+
+def read_state(path: Path) -> dict | None:
+    # Comentario: Solo el esquema (pie del archivo): el `state` guardado por write_frame, sin leer datos
+    raw = (pq.read_schema(path).metadata or {}).get(_STATE_KEY)
+    return json.loads(raw.decode("utf-8")) if raw else None
+
+
+def evict(cache_dir: Path, max_bytes: int) -> int:
+    # Comentario: LRU por mtime (se "toca" el archivo en cada hit); devuelve cuántos se borraron
+    files = sorted(cache_dir.glob("*.parquet"), key=lambda p: p.stat().st_mtime, reverse=True)
+    total = 0
+    removed = 0
+    for p in files:
+        size = p.stat().st_size
+        if total + size > max_bytes:
+            p.unlink(missing_ok=True)
+            removed += 1
+        else:
+            total += size
+    return removed
+
+
+def get_or_build(
+    file_bytes: bytes,
+    sheet_name: str,
+    build: Callable[[bytes, str], pd.DataFrame],
+    cache_dir: Path | str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> tuple[pd.DataFrame, bool]:
+    """
+    Comentario: Devuelve (df, hit). En miss ejecuta build(), guarda el Parquet
+    y aplica la expulsión por tamaño.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{cache_key(file_bytes, sheet_name)}.parquet"
+
+    if path.exists():
+        try:
+            df = read_frame(path)
+            os.utime(path)
+            return df, True
+        except Exception:
+            # Comentario: Archivo corrupto → se reconstruye
+            path.unlink(missing_ok=True)
+
+    df = build(file_bytes, sheet_name)
+    try:
+        write_frame(path, df)
+        evict(cache_dir, max_bytes)
+    except Exception:
+        # Comentario: El cache es una optimización; un fallo de escritura no debe romper la carga
+        pass
+    return df, False
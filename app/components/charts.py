@@ -1 +1,168 @@
 # Gráficos
+from collections import OrderedDict
+from typing import Callable
+
+import altair as alt
+import pandas as pd
+
+# Comentario: Granularidad según el largo del período (puntos enviados al navegador acotados)
+GRANULARIDADES = (
+    (92, "D", "dia"),
+    (731, "W-MON", "semana"),
+    (None, "MS", "mês"),
+)
+TITULO_BIN = {"dia": "Data", "semana": "Início da semana", "mês": "Mês"}
+RANKING_MAX = 10
+
+
+def choose_granularity(d1, d2) -> tuple[str, str]:
+    # Comentario: Devuelve (freq de pandas, rótulo)
+    dias = (pd.Timestamp(d2) - pd.Timestamp(d1)).days + 1
+    for limite, freq, rotulo in GRANULARIDADES:
+        if limite is None or dias <= limite:
+            return freq, rotulo
+    return GRANULARIDADES[-1][1], GRANULARIDADES[-1][2]
+
+
+def binned_trend(trend_df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Comentario: Agrupa la serie diaria en bins. El valor es el m² por día (media de los
+    días con registro dentro del bin), así la línea de meta diaria sigue siendo comparable.
+    """
+    s = trend_df.assign(DATA=pd.to_datetime(trend_df["DATA"])).set_index("DATA")["m2_total"]
+    if freq == "D":
+        out = s.to_frame()
+        out["dias"] = 1
+        return out.reset_index()
+    g = s.resample(freq, label="left", closed="left")
+    out = pd.DataFrame({"m2_total": g.mean(), "dias": g.count()})
+    return out[out["dias"] > 0].reset_index()
+
+
+def trend_chart(trend_df: pd.DataFrame, meta_diaria: float | None, rotulo: str = "dia") -> alt.LayerChart:
+    tooltip = [
+        alt.Tooltip("DATA:T", title=TITULO_BIN[rotulo]),
+        alt.Tooltip("m2_total:Q", title="m² / dia", format=",.0f"),
+    ]
+    if rotulo != "dia":
+        tooltip.append(alt.Tooltip("dias:Q", title="Dias com registro"))
+
+    area = alt.Chart(trend_df).mark_area(
+        line={"color": "#2563eb", "strokeWidth": 3},
+        opacity=0.18
+    ).encode(
+        x=alt.X("DATA:T", title=None),
+        y=alt.Y("m2_total:Q", title=None),
+        tooltip=tooltip
+    )
+
+    layers = [area]
+
+    # Comentario: Línea de meta (si existe)
+    if meta_diaria is not None:
+        meta_line = alt.Chart(pd.DataFrame({"meta": [meta_diaria]})).mark_rule(
+            color="#ef4444", strokeWidth=2
+        ).encode(
+            y="meta:Q",
+            tooltip=[alt.Tooltip("meta:Q", title="Meta (m²/dia)", format=",.0f")]
+        )
+        layers.append(meta_line)
+
+    return alt.layer(*layers).properties(height=260)
+
+
+def ranking_chart(rank: pd.DataFrame) -> alt.Chart:
+    # Comentario: Nunca más de RANKING_MAX barras en el spec
+    rank = rank.head(RANKING_MAX).assign(EQUIPE=lambda d: d["EQUIPE"].astype(str))
+    return alt.Chart(rank).mark_bar(
+        cornerRadiusTopRight=10, cornerRadiusBottomRight=10, color="#2563eb"
+    ).encode(
+        y=alt.Y("EQUIPE:N", sort="-x", title=None),
+        x=alt.X("m2_total:Q", title=None),
+        tooltip=[
+            alt.Tooltip("EQUIPE:N", title="Equipe"),
+            alt.Tooltip("m2_total:Q", title="m²", format=",.0f")
+        ]
+    ).properties(height=260)
+
+
+def composition_chart(comp_df: pd.DataFrame) -> alt.Chart:
+    return alt.Chart(comp_df).mark_arc(innerRadius=70).encode(
+        theta=alt.Theta("m2:Q"),
+        color=alt.Color("Tipo:N", scale=alt.Scale(range=["#94a3b8", "#2563eb", "#10b981"]),
+                        legend=alt.Legend(title=None)),
+        tooltip=[
+            alt.Tooltip("Tipo:N", title="Tipo"),
+            alt.Tooltip("m2:Q", title="m²", format=",.0f")
+        ]
+    ).properties(height=260)
+
+
+def team_daily_chart(serie: pd.DataFrame, medias: dict[str, str], meta_diaria: float | None = None) -> alt.LayerChart:
+    # Comentario: m² por día de la equipe (barras) + medias móviles {columna: rótulo} (líneas)
+    barras = alt.Chart(serie).mark_bar(color="#93c5fd", opacity=0.7).encode(
+        x=alt.X("DATA:T", title=None),
+        y=alt.Y("m2_total:Q", title=None),
+        tooltip=[
+            alt.Tooltip("DATA:T", title="Data"),
+            alt.Tooltip("m2_total:Q", title="m²", format=",.0f"),
+            *(alt.Tooltip(f"{c}:Q", title=r, format=",.0f") for c, r in medias.items()),
+        ]
+    )
+    linhas = alt.Chart(serie).transform_fold(list(medias), as_=["media", "valor"]).transform_calculate(
+        rotulo="{" + ", ".join(f"'{c}': '{r}'" for c, r in medias.items()) + "}[datum.media]"
+    ).mark_line(strokeWidth=2.5).encode(
+        x="DATA:T",
+        y="valor:Q",
+        color=alt.Color("rotulo:N", scale=alt.Scale(range=["#2563eb", "#0f172a"]), legend=alt.Legend(title=None, orient="top"))
+    )
+    layers = [barras, linhas]
+    if meta_diaria is not None:
+        layers.append(alt.Chart(pd.DataFrame({"meta": [meta_diaria]})).mark_rule(color="#ef4444", strokeWidth=2).encode(
+            y="meta:Q",
+            tooltip=[alt.Tooltip("meta:Q", title="Meta (m²/dia)", format=",.0f")]
+        ))
+    return alt.layer(*layers).properties(height=280)
+
+
+def fronts_chart(serie: pd.DataFrame, frentes: dict[str, str], freq: str, rotulo: str = "dia") -> alt.Chart:
+    # Comentario: m² por frente {columna: rótulo}, barras apiladas por bin (suma del bin)
+    g = serie.set_index("DATA")[list(frentes)]
+    if freq != "D":
+        g = g.resample(freq, label="left", closed="left").sum()
+    longo = g.rename(columns=frentes).reset_index().melt("DATA", var_name="Frente", value_name="m2")
+    longo = longo[longo["m2"] > 0]
+    return alt.Chart(longo).mark_bar().encode(
+        x=alt.X("DATA:T", title=None),
+        y=alt.Y("m2:Q", title=None, stack="zero"),
+        color=alt.Color("Frente:N", sort=list(frentes.values()), legend=alt.Legend(title=None, orient="top")),
+        tooltip=[
+            alt.Tooltip("DATA:T", title=TITULO_BIN[rotulo]),
+            alt.Tooltip("Frente:N", title="Frente"),
+            alt.Tooltip("m2:Q", title="m²", format=",.0f")
+        ]
+    ).properties(height=260)
+
+
+class SpecCache:
+    """
+    Comentario: Specs Vega-Lite (to_dict) por (gráfico, base, estado de filtros). En un rerun sin
+    cambios no se recalcula la consulta ni se vuelve a armar el gráfico con Altair; Streamlit
+    igual hace json.dumps del dict (pocos KB), pero un spec idéntico sale con el mismo hash y
+    llega al navegador como referencia (ver global.minCachedMessageSize en .streamlit/config.toml).
+    """
+
+    def __init__(self, max_items: int = 64):
+        self.max_items = max_items
+        self._specs: OrderedDict = OrderedDict()
+
+    def get(self, key, build: Callable[[], alt.TopLevelMixin]) -> dict:
+        spec = self._specs.get(key)
+        if spec is None:
+            spec = build().to_dict()
+            self._specs[key] = spec
+            if len(self._specs) > self.max_items:
+                self._specs.popitem(last=False)
+        else:
+            self._specs.move_to_end(key)
+        return spec
@@ -0,0 +1,40 @@
+# Memoria: base compacta para la sesión
+import numpy as np
+import pandas as pd
+
+from components.filters import FILTER_DIMENSIONS
+from components.metrics import m2_columns
+from components.quality import QC_COLUMN
+from components.segments import km_columns
+
+# Comentario: Columnas que alguna vista usa (filtros, cubo, calidad, detalle, cobertura KM)
+VIEW_COLUMNS = ["DATA", *FILTER_DIMENSIONS, QC_COLUMN, *m2_columns(), *km_columns()]
+MEASURE_DTYPE = "float32"
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Comentario: Deja solo VIEW_COLUMNS, dimensiones como categóricas, m2_* y KM en float32
+    (KM no numérico → NaN; la columna qc_flags ya lo registró).
+    Los totales se siguen sumando en float64 (build_cube). El antes/después de esta etapa
+    queda en df.attrs["memoria"] = {"antes": bytes, "depois": bytes}; "antes" es el frame
+    que sale del pipeline, ya sin las columnas que el lector no carga (no el Excel completo).
+    """
+    antes = memory_bytes(df)
+    out = df[[c for c in VIEW_COLUMNS if c in df.columns]].copy()
+    for c in FILTER_DIMENSIONS:
+        if c in out.columns and not isinstance(out[c].dtype, pd.CategoricalDtype):
+            out[c] = out[c].astype("category")
+    medidas = [c for c in m2_columns() if c in out.columns]
+    out[medidas] = out[medidas].astype(MEASURE_DTYPE)
+    for c in km_columns():
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype(MEASURE_DTYPE)
+    if QC_COLUMN in out.columns:
+        out[QC_COLUMN] = out[QC_COLUMN].astype(np.uint8)
+    out.attrs = {**df.attrs, "memoria": {"antes": antes, "depois": memory_bytes(out)}}
+    return out
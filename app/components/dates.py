@@ -0,0 +1,128 @@
+# Fechas: normalización de DATA (texto / datetime / serial de Excel)
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+# Comentario: Serial de Excel → días desde 1970 (origen 1899-12-30: serial 25569 = 1970-01-01)
+EXCEL_EPOCH_SERIAL = 25569
+SERIAL_MIN, SERIAL_MAX = 1, 2958465  # Comentario: 1900-01-01 … 9999-12-31
+
+# Comentario: Formatos candidatos (orden = preferencia en empate; el formulário es dd/mm)
+FORMATOS = ("%d/%m/%Y", "ISO8601", "%d-%m-%Y", "%d/%m/%y", "%d.%m.%Y", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M")
+AMOSTRA = 256
+
+_NAT = np.datetime64("NaT", "D")
+
+
+def serial_to_days(serial: np.ndarray) -> np.ndarray:
+    # Comentario: Aritmética entera: floor(serial) - 25569; fuera de rango → NaT
+    v = np.asarray(serial, dtype="float64")
+    ok = (v >= SERIAL_MIN) & (v < SERIAL_MAX + 1)
+    out = np.full(len(v), _NAT)
+    out[ok] = (np.floor(v[ok]).astype("int64") - EXCEL_EPOCH_SERIAL).astype("datetime64[D]")
+    return out
+
+
+def _parse_format(textos: np.ndarray, fmt: str) -> np.ndarray:
+    parsed = pd.to_datetime(pd.Series(textos, dtype=object), format=fmt, errors="coerce")
+    return parsed.to_numpy("datetime64[D]") if len(textos) else np.empty(0, dtype="datetime64[D]")
+
+
+def infer_format(textos: np.ndarray) -> list[str]:
+    """
+    Comentario: Todos los FORMATOS, ordenados por cuántos textos de la muestra parsean (se mide
+    una vez). Los que no aparecen en la muestra van al final, en el orden de FORMATOS: un
+    formato que empieza a usarse después de la muestra también se prueba.
+    """
+    amostra = textos[:AMOSTRA]
+    score = {fmt: int((~np.isnat(_parse_format(amostra, fmt))).sum()) for fmt in FORMATOS}
+    return sorted(FORMATOS, key=lambda f: -score[f])
+
+
+def _parse_texts(textos: np.ndarray) -> np.ndarray:
+    # Comentario: Formato dominante en una pasada vectorizada; lo que sobra prueba los demás
+    # formatos (solo sobre lo pendiente) y, al final, números escritos como texto (serial)
+    out = np.full(len(textos), _NAT)
+    pend = np.arange(len(textos))
+    for fmt in infer_format(textos):
+        if not len(pend):
+            break
+        got = _parse_format(textos[pend], fmt)
+        ok = ~np.isnat(got)
+        out[pend[ok]] = got[ok]
+        pend = pend[~ok]
+    if len(pend):
+        num = pd.to_numeric(pd.Series(textos[pend], dtype=object), errors="coerce").to_numpy("float64")
+        out[pend] = serial_to_days(num)
+    return out
+
+
+def _kind(v) -> int:
+    # Comentario: 0 = vacío, 1 = fecha, 2 = número (serial), 3 = texto, 4 = otro
+    if v is None or v is pd.NaT or (isinstance(v, float) and v != v):
+        return 0
+    if isinstance(v, (dt.date, np.datetime64)):
+        return 1
+    if isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool):
+        return 2
+    if isinstance(v, str):
+        # Comentario: Celda con solo espacios = vacía (no es una fecha inválida)
+        return 3 if v.strip() else 0
+    return 4
+
+
+def parse_dates(values: pd.Series) -> tuple[np.ndarray, int]:
+    """
+    Comentario: Convierte DATA a datetime64[D]. Devuelve (días, cantidad de valores no vacíos
+    que no se pudieron leer). Se trabaja sobre los valores distintos (factorize): una
+    fecha repetida en miles de filas se parsea una sola vez.
+    """
+    s = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        dias = s.to_numpy("datetime64[D]")
+        return dias, 0
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        dias = serial_to_days(s.to_numpy("float64", na_value=np.nan))
+        return dias, int((np.isnat(dias) & s.notna().to_numpy()).sum())
+
+    codes, uniques = pd.factorize(s.astype(object), use_na_sentinel=True)
+    if not len(uniques):
+        return np.full(len(s), _NAT), 0
+    uniques = np.asarray(uniques, dtype=object)
+    kinds = np.fromiter(map(_kind, uniques), dtype="int8", count=len(uniques))
+    parsed = np.full(len(uniques), _NAT)
+
+    m = kinds == 1
+    if m.any():
+        parsed[m] = pd.to_datetime(pd.Series(uniques[m], dtype=object), errors="coerce").to_numpy("datetime64[D]")
+    m = kinds == 2
+    if m.any():
+        parsed[m] = serial_to_days(uniques[m].astype("float64"))
+    m = kinds == 3
+    if m.any():
+        textos = np.array([t.strip() for t in uniques[m]], dtype=object)
+        parsed[m] = _parse_texts(textos)
+
+    dias = np.where(codes >= 0, parsed[np.maximum(codes, 0)], _NAT)
+    vazios = (codes < 0) | (kinds[np.maximum(codes, 0)] == 0)
+    return dias, int((np.isnat(dias) & ~vazios).sum())
+
+
+def normalize_date_column(df: pd.DataFrame, col: str = "DATA") -> tuple[pd.DataFrame, int, int]:
+    """
+    Comentario: DATA → datetime64 a medianoche (resolución de día). Filas sin fecha legible
+    se descartan. Devuelve (df, inválidas, vacías): las inválidas son las que tenían algo en
+    DATA que no se pudo leer; las vacías (celda en blanco o solo espacios), aparte.
+    """
+    if col not in df.columns:
+        return df, 0, 0
+    dias, invalidas = parse_dates(df[col])
+    ok = ~np.isnat(dias)
+    # Comentario: pandas no tiene unidad "D": se guarda en ms (la unidad que devuelve Parquet),
+    # siempre a medianoche
+    df = df.assign(**{col: dias.astype("datetime64[ms]")})
+    n_drop = int(len(df) - ok.sum())
+    if n_drop:
+        df = df[ok]
+    return df, invalidas, n_drop - invalidas
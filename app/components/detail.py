@@ -0,0 +1,39 @@
+# Tabla de detalle paginada
+import numpy as np
+
+from components.filters import FilteredView
+
+PAGE_SIZE = 500
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    # Comentario: Índices de los k mayores (argpartition O(n) + orden de solo k elementos)
+    n = len(values)
+    if k >= n:
+        return np.argsort(-values, kind="stable")
+    part = np.argpartition(-values, k - 1)[:k]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+def sort_permutation(values: np.ndarray) -> np.ndarray:
+    # Comentario: Permutación completa (desc); se cachea por estado de filtros
+    return np.argsort(-values, kind="stable")
+
+
+def candidate_positions(view: FilteredView, only_zero: bool, col: str = "m2_total") -> tuple[np.ndarray, np.ndarray]:
+    # Comentario: (posiciones, valores de orden) de las filas elegibles para la tabla
+    pos = view.positions()
+    vals = view.column(col).astype("float64", copy=False)
+    if only_zero:
+        keep = vals <= 0
+        pos, vals = pos[keep], vals[keep]
+    return pos, vals
+
+
+def page_positions(pos: np.ndarray, order: np.ndarray, page: int, page_size: int = PAGE_SIZE) -> np.ndarray:
+    # Comentario: Posiciones absolutas de la página pedida (0-based)
+    return pos[order[page * page_size:(page + 1) * page_size]]
+
+
+def page_count(n: int, page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-n // page_size))
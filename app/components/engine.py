@@ -0,0 +1,128 @@
+# Motor sin Streamlit: carga + KPIs (compartido por el dashboard y la CLI)
+import io
+from pathlib import Path
+
+import pandas as pd
+
+from components.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, get_or_build
+from components.compact import compact_frame
+from components.dates import normalize_date_column
+from components.filters import FilteredView, FilterIndex
+from components.incremental import load_incremental
+from components.jobs import report_stage
+from components.metas import MetasIndex, daily_team_goals, team_goal_summary
+from components.metrics import build_cube, enrich_m2, kpis, ranking
+from components.quality import CHECAGENS, flag_counts, mark_duplicates, validate_rows
+from components.segments import SegmentIndex
+
+DEFAULT_SHEET = "Respostas ao formulário 1"
+
+
+# =========================
+# Carga
+# =========================
+def process_data_rows(df: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: Valida, normaliza y calcula m² (se aplica a la base completa o solo a las filas nuevas)
+    report_stage("normalizando")
+    df = validate_rows(df)
+    df, data_invalida, data_vazia = normalize_date_column(df, "DATA")
+    report_stage("enriquecendo")
+    df = enrich_m2(df)
+    # Comentario: Filas con DATA ilegible o vacía se descartan; quedan los conteos (por separado)
+    df.attrs["qualidade"] = {"data_invalida": data_invalida, "data_vazia": data_vazia}
+    return df
+
+
+def build_excel_data(file_bytes: bytes, sheet_name: str, source: str = "",
+                     cache_dir: Path | str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> pd.DataFrame:
+    # Comentario: Lee el Excel de datos desde bytes; solo procesa las filas nuevas de `source`
+    state_dir = Path(cache_dir) / "incremental"
+    df = load_incremental(file_bytes, sheet_name, source, process_data_rows, state_dir, max_bytes)
+    # Comentario: Duplicados se marcan sobre la base completa (una fila nueva puede repetir una vieja)
+    df = mark_duplicates(df)
+    # Comentario: La sesión (y el Parquet en cache) solo guardan lo que las vistas usan
+    return compact_frame(df)
+
+
+def load_excel_data(file_bytes: bytes, sheet_name: str, source: str = "",
+                    cache_dir: Path | str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> tuple[pd.DataFrame, bool]:
+    # Comentario: Devuelve (df, hit). Hit = Parquet ya convertido en disco (no se parsea el Excel)
+    def build(b: bytes, s: str) -> pd.DataFrame:
+        return build_excel_data(b, s, source, cache_dir, max_bytes)
+    return get_or_build(file_bytes, sheet_name, build, cache_dir, max_bytes)
+
+
+def load_excel_metas(file_bytes: bytes) -> pd.DataFrame:
+    # Comentario: Lee el Excel de metas (sheet: Metas)
+    df = pd.read_excel(io.BytesIO(file_bytes), sheet_name="Metas")
+
+    # Comentario: Limpieza mínima y tipado
+    needed = ["Nivel", "Referencia", "Metrica", "Periodo", "Meta"]
+    for c in needed:
+        if c not in df.columns:
+            raise ValueError(f"Coluna obrigatória ausente no Excel de metas: {c}")
+
+    df = df.dropna(subset=needed).copy()
+    df["Nivel"] = df["Nivel"].astype(str).str.strip()
+    df["Referencia"] = df["Referencia"].astype(str).str.strip()
+    df["Metrica"] = df["Metrica"].astype(str).str.strip()
+    df["Periodo"] = df["Periodo"].astype(str).str.strip()
+    df["Meta"] = pd.to_numeric(df["Meta"], errors="coerce")
+    df["Prioridade"] = pd.to_numeric(df.get("Prioridade", 99), errors="coerce").fillna(99).astype(int)
+
+    # Comentario: Fechas opcionales (validez)
+    if "Ativo de" in df.columns:
+        df["Ativo de"] = pd.to_datetime(df["Ativo de"], errors="coerce").dt.date
+    else:
+        df["Ativo de"] = pd.NaT
+
+    if "Ativo até" in df.columns:
+        df["Ativo até"] = pd.to_datetime(df["Ativo até"], errors="coerce").dt.date
+    else:
+        df["Ativo até"] = pd.NaT
+
+    df = df[df["Meta"].notna()].copy()
+    return df
+
+
+# =========================
+# Resumen (lote)
+# =========================
+def summarize(df: pd.DataFrame, df_metas: pd.DataFrame | None = None, d1=None, d2=None) -> dict[str, pd.DataFrame]:
+    """
+    Comentario: Las mismas cuentas del dashboard, sin filtros de dimensión:
+    - kpis: una fila (KPIs + cobertura KM + checagens de calidad + meta diaria general y atingimento);
+    - ranking: m² por equipe (todas);
+    - cobertura_equipe: km únicos / sobrepuestos y lacunas por equipe;
+    - metas_diarias / metas_equipe: atingimento por (DATA, EQUIPE) y su resumen.
+    """
+    cube_idx = FilterIndex(build_cube(df, contagens=flag_counts(df)))
+    dias = cube_idx.df["DATA"]
+    if d1 is None:
+        d1 = dias.iloc[0].date() if len(dias) else None
+    if d2 is None:
+        d2 = dias.iloc[-1].date() if len(dias) else None
+    cube = cube_idx.select(d1, d2, {}).frame() if len(dias) else cube_idx.df
+    df_idx = FilterIndex(df)
+    segmentos = SegmentIndex(df_idx.df)
+    view = df_idx.select(d1, d2, {}) if len(dias) else FilteredView(df_idx.df, slice(0, 0))
+
+    kpi = kpis(cube)
+    cob = segmentos.coverage(view)
+    meta = MetasIndex(df_metas).resolve({}, d1, d2)
+    qc = {col: int(cube[col].sum()) for col, _ in CHECAGENS.values() if col in cube.columns}
+    linha = {"de": d1, "ate": d2, **kpi,
+             "km_total": cob.km_total, "km_unicos": cob.km_unicos, "km_sobreposto": cob.km_sobreposto,
+             "m2_sobreposto": cob.m2_sobreposto, "km_lacunas": cob.km_lacunas, **qc,
+             "data_invalida": df.attrs.get("qualidade", {}).get("data_invalida", 0),
+             "data_vazia": df.attrs.get("qualidade", {}).get("data_vazia", 0),
+             "meta_diaria": meta,
+             "atingimento": (kpi["m2_por_dia"] / meta * 100) if meta else None}
+    pares = daily_team_goals(cube, df_metas)
+    return {
+        "kpis": pd.DataFrame([linha]),
+        "ranking": ranking(cube, top=len(cube)).reset_index(drop=True),
+        "cobertura_equipe": segmentos.by_team(view),
+        "metas_diarias": pares,
+        "metas_equipe": team_goal_summary(pares),
+    }
@@ -0,0 +1,165 @@
+# Exportación de la selección (registros + agregados) en CSV, Parquet y XLSX
+import zipfile
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+
+from components.filters import FilteredView
+from components.quality import QC_COLUMN
+from components.segments import Cobertura
+
+CHUNK_ROWS = 50_000
+XLSX_MAX_ROWS = 1_048_575  # Comentario: límite de filas de una hoja (sin el encabezado)
+XLSX_AVISO = 200_000  # Comentario: a partir de aquí el tablero sugiere CSV/Parquet (openpyxl escribe fila a fila)
+
+# Comentario: formato → (extensión, mime); CSV y Parquet van en un .zip (un archivo por tabla)
+EXPORT_FORMATS = {
+    "csv": ("zip", "application/zip"),
+    "parquet": ("zip", "application/zip"),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+DADOS = "dados"
+
+
+def export_columns(df: pd.DataFrame) -> list[str]:
+    # Comentario: Columnas de la base compacta, sin las internas (bits de calidad)
+    return [c for c in df.columns if c != QC_COLUMN]
+
+
+def report_tables(kpi: dict, cobertura: Cobertura | None, tendencia: pd.DataFrame, ranking: pd.DataFrame,
+                  composicao: pd.DataFrame, meta_diaria: float | None = None,
+                  metas_equipe: pd.DataFrame | None = None) -> dict[str, pd.DataFrame]:
+    # Comentario: {nombre: tabla} con los mismos números del tablero (se arman de los mismos nodos)
+    linhas = [
+        ("m² total", kpi["m2_total"]),
+        ("Dias com registro", kpi["dias"]),
+        ("m² por dia", kpi["m2_por_dia"]),
+        ("Equipes ativas", kpi["equipes_ativas"]),
+        ("Registros", kpi["registros"]),
+        ("Registros com m² = 0", kpi["registros_zero"]),
+    ]
+    if cobertura is not None:
+        linhas += [("km únicos", cobertura.km_unicos), ("km sobrepostos", cobertura.km_sobreposto),
+                   ("m² sobreposto", cobertura.m2_sobreposto), ("km em lacunas", cobertura.km_lacunas)]
+    if meta_diaria is not None:
+        linhas += [("Meta (m²/dia)", meta_diaria),
+                   ("Meta atingida", "sim" if kpi["m2_por_dia"] >= meta_diaria else "não")]
+    tabelas = {
+        "kpis": pd.DataFrame(linhas, columns=["Indicador", "Valor"], dtype=object),
+        "tendencia": tendencia.reset_index(drop=True),
+        "ranking": ranking.reset_index(drop=True),
+        "composicao": composicao.reset_index(drop=True),
+    }
+    if metas_equipe is not None and not metas_equipe.empty:
+        tabelas["metas_equipe"] = metas_equipe.reset_index(drop=True)
+    return tabelas
+
+
+def iter_chunks(view: FilteredView, cols: list[str], chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Comentario: Los registros del filtro en bloques de `chunk_rows` filas, en el orden de la
+    base (por DATA). Solo un bloque materializado a la vez: exportar todo no arma una copia
+    de la selección.
+    """
+    pos = view.positions()
+    for ini in range(0, len(pos), chunk_rows):
+        yield view.take(pos[ini:ini + chunk_rows], cols)
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: Objetos mixtos → texto (Parquet exige un tipo por columna, igual en todos los chunks)
+    return df.astype({c: "string" for c in df.columns if df[c].dtype == object})
+
+
+def write_parquet(chunks: Iterator[pd.DataFrame], sink: BinaryIO) -> int:
+    # Comentario: Un row group por chunk (ParquetWriter); el esquema sale del primer chunk
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    n = 0
+    try:
+        for chunk in chunks:
+            t = pa.Table.from_pandas(_arrow_safe(chunk), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, t.schema)
+            writer.write_table(t.cast(writer.schema))
+            n += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
+
+
+def _xlsx_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    # Comentario: NaN/NaT → celda vacía; categóricas → texto
+    valores = df.astype(object).where(df.notna(), None)
+    return valores.itertuples(index=False, name=None)
+
+
+def write_xlsx(chunks: Iterator[pd.DataFrame], cols: list[str], tabelas: dict[str, pd.DataFrame], sink: BinaryIO) -> int:
+    """
+    Comentario: Libro en modo write_only (openpyxl escribe cada fila al XML y la suelta).
+    Los registros pasan de a chunk; al llegar al límite de filas siguen en "dados (2)", etc.
+    Cada agregado va en su propia hoja, después de los registros.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    folha, parte, linhas, n = None, 0, XLSX_MAX_ROWS, 0
+    for chunk in chunks:
+        for row in _xlsx_rows(chunk):
+            if linhas == XLSX_MAX_ROWS:
+                parte += 1
+                folha = wb.create_sheet(DADOS if parte == 1 else f"{DADOS} ({parte})")
+                folha.append(cols)
+                linhas = 0
+            folha.append(row)
+            linhas += 1
+        n += len(chunk)
+    if folha is None:
+        wb.create_sheet(DADOS).append(cols)
+    for nome, tabela in tabelas.items():
+        ws = wb.create_sheet(nome)
+        ws.append(list(tabela.columns))
+        for row in _xlsx_rows(tabela):
+            ws.append(row)
+    wb.save(sink)
+    return n
+
+
+def export_file(formato: str, view: FilteredView, cols: list[str], tabelas: dict[str, pd.DataFrame],
+                sink: BinaryIO, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Comentario: Escribe la exportación en `sink` (archivo o BytesIO) a medida que salen los
+    chunks; devuelve las filas exportadas. CSV / Parquet: un .zip con `dados` + una tabla
+    por agregado; XLSX: una hoja por tabla.
+    """
+    chunks = iter_chunks(view, cols, chunk_rows)
+    if formato == "xlsx":
+        return write_xlsx(chunks, cols, tabelas, sink)
+    if formato == "csv":
+        n = 0
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zf.open(f"{DADOS}.csv", "w", force_zip64=True) as f:
+                f.write(pd.DataFrame(columns=cols).to_csv(index=False).encode("utf-8"))
+                for chunk in chunks:
+                    f.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+                    n += len(chunk)
+            for nome, tabela in tabelas.items():
+                zf.writestr(f"{nome}.csv", tabela.to_csv(index=False))
+        return n
+    if formato == "parquet":
+        # Comentario: Parquet ya viene comprimido → el zip solo empaqueta (ZIP_STORED)
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zf:
+            with zf.open(f"{DADOS}.parquet", "w", force_zip64=True) as f:
+                n = write_parquet(chunks, f)
+            for nome, tabela in tabelas.items():
+                with zf.open(f"{nome}.parquet", "w") as f:
+                    write_parquet(iter([tabela]), f)
+        return n
+    raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+
+def file_name(formato: str, d1, d2) -> str:
+    return f"producao_{pd.Timestamp(d1):%Y%m%d}_{pd.Timestamp(d2):%Y%m%d}.{EXPORT_FORMATS[formato][0]}"
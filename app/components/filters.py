@@ -1 +1,109 @@
 # Filtros
+import numpy as np
+import pandas as pd
+
+FILTER_DIMENSIONS = ["EQUIPE", "NOME DO ENCARREGADO", "SUPERVISOR"]
+
+
+def _to_days(values) -> np.ndarray:
+    # Comentario: Fechas (date / datetime64) → días desde 1970 (int64) para búsqueda binaria
+    return pd.to_datetime(pd.Series(values)).to_numpy("datetime64[D]").astype("int64")
+
+
+class FilteredView:
+    """
+    Comentario: Resultado de un filtro: solo posiciones (slice o array) sobre la base ordenada.
+    El DataFrame se materializa recién cuando un widget lo pide (y queda guardado).
+    """
+
+    def __init__(self, df: pd.DataFrame, rows: slice | np.ndarray):
+        self._df = df
+        self.rows = rows
+        self._frame = None
+
+    def __len__(self) -> int:
+        if isinstance(self.rows, slice):
+            return self.rows.stop - self.rows.start
+        return len(self.rows)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def column(self, col: str) -> np.ndarray:
+        # Comentario: Valores de una columna sin armar el frame filtrado
+        return self._df[col].to_numpy()[self.rows]
+
+    def positions(self) -> np.ndarray:
+        # Comentario: Posiciones absolutas (sobre la base ordenada) de las filas del filtro
+        if isinstance(self.rows, slice):
+            return np.arange(self.rows.start, self.rows.stop)
+        return self.rows
+
+    def take(self, positions: np.ndarray, columns: list[str]) -> pd.DataFrame:
+        # Comentario: Solo las filas/columnas pedidas (ej. una página de la tabla)
+        return self._df[columns].iloc[positions]
+
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = self._df.iloc[self.rows]
+        return self._frame
+
+
+class FilterIndex:
+    """
+    Comentario: Índice construido al cargar:
+    - filas ordenadas por DATA → el período es un slice por búsqueda binaria;
+    - EQUIPE / ENCARREGADO / SUPERVISOR como categóricas (códigos int);
+    - por categoría, las posiciones (ordenadas) de sus filas.
+    """
+
+    def __init__(self, df: pd.DataFrame, dims: list[str] = FILTER_DIMENSIONS):
+        dias = _to_days(df["DATA"])
+        order = np.argsort(dias, kind="stable")
+        # Comentario: order[i] = fila original en la posición i (para mapear estructuras externas)
+        self.order = order
+        self.df = df.iloc[order].reset_index(drop=True)
+        self.dias = dias[order]
+
+        self.codigos: dict[str, dict[str, int]] = {}
+        self.posicoes: dict[str, list[np.ndarray]] = {}
+        for dim in dims:
+            if dim not in self.df.columns:
+                continue
+            cat = pd.Categorical(self.df[dim])
+            if not isinstance(self.df[dim].dtype, pd.CategoricalDtype):
+                self.df[dim] = cat
+            codes = cat.codes
+            # Comentario: Orden estable por código → cada categoría queda con sus posiciones crecientes
+            by_code = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[by_code], np.arange(len(cat.categories) + 1))
+            self.posicoes[dim] = [by_code[bounds[i]:bounds[i + 1]] for i in range(len(cat.categories))]
+            # Comentario: El filtro compara como texto (igual que .astype(str).isin)
+            self.codigos[dim] = {str(c): i for i, c in enumerate(cat.categories)}
+
+    def _date_slice(self, d1, d2) -> tuple[int, int]:
+        lo = int(np.searchsorted(self.dias, _to_days([d1])[0], side="left"))
+        hi = int(np.searchsorted(self.dias, _to_days([d2])[0], side="right"))
+        return lo, max(lo, hi)
+
+    def select(self, d1, d2, selecoes: dict[str, list]) -> FilteredView:
+        # Comentario: selecoes = {dimensión: valores elegidos}; lista vacía = sin filtro
+        lo, hi = self._date_slice(d1, d2)
+        mask = None
+        for dim, valores in selecoes.items():
+            if not valores or dim not in self.posicoes:
+                continue
+            m = np.zeros(hi - lo, dtype=bool)
+            for v in valores:
+                code = self.codigos[dim].get(str(v))
+                if code is None:
+                    continue
+                p = self.posicoes[dim][code]
+                p = p[np.searchsorted(p, lo):np.searchsorted(p, hi)]
+                m[p - lo] = True
+            mask = m if mask is None else (mask & m)
+
+        if mask is None:
+            return FilteredView(self.df, slice(lo, hi))
+        return FilteredView(self.df, np.flatnonzero(mask) + lo)
@@ -0,0 +1,108 @@
+# Ingestión incremental (la aba de respuestas solo crece)
+import hashlib
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from components.cache import CACHE_VERSION, DEFAULT_MAX_BYTES, evict, read_frame, read_state, write_frame
+from components.reader import DATA_COLUMNS, read_sheet
+
+# Comentario: Columnas que identifican una respuesta del formulario (todas en DATA_COLUMNS).
+# Ediciones en otras columnas de filas antiguas NO se detectan (se asume append-only).
+KEY_COLUMNS = ["Carimbo de data/hora", "DATA", "EQUIPE", "NOME DO ENCARREGADO", "SUPERVISOR"]
+
+
+def fingerprint(keys: pd.DataFrame) -> str:
+    # Comentario: Hash estable de las columnas clave (orden de filas incluido)
+    h = hashlib.sha256()
+    h.update(",".join(map(str, keys.columns)).encode("utf-8"))
+    if len(keys):
+        hashes = pd.util.hash_pandas_object(keys.astype(str), index=False)
+        h.update(hashes.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _append(df_old: pd.DataFrame, tail: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: concat de categóricas con categorías distintas cae a object; se unifican antes
+    df_old = df_old.copy()
+    tail = tail.copy()
+    for c in df_old.columns.intersection(tail.columns):
+        if isinstance(df_old[c].dtype, pd.CategoricalDtype) and isinstance(tail[c].dtype, pd.CategoricalDtype):
+            uc = union_categoricals([df_old[c].array, tail[c].array])
+            df_old[c] = pd.Categorical(df_old[c], categories=uc.categories)
+            tail[c] = pd.Categorical(tail[c], categories=uc.categories)
+    out = pd.concat([df_old, tail], ignore_index=True)
+    # Comentario: concat descarta attrs distintos; los contadores (dict de enteros) se suman
+    attrs = dict(df_old.attrs)
+    for k, v in tail.attrs.items():
+        prev = attrs.get(k)
+        if isinstance(v, dict) and isinstance(prev, dict):
+            v = {**prev, **{n: prev.get(n, 0) + x for n, x in v.items()}}
+        attrs[k] = v
+    out.attrs = attrs
+    return out
+
+
+def _state_path(state_dir: Path, source: str, sheet_name: str) -> Path:
+    # Comentario: Un solo archivo por (source, aba): datos + {rows, fingerprint} en la metadata
+    sid = hashlib.sha256(f"{CACHE_VERSION}\0{source}\0{sheet_name}".encode("utf-8")).hexdigest()[:24]
+    return state_dir / f"{sid}.parquet"
+
+
+def load_incremental(
+    file_bytes: bytes,
+    sheet_name: str,
+    source: str,
+    process: Callable[[pd.DataFrame], pd.DataFrame],
+    state_dir: Path | str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> pd.DataFrame:
+    """
+    Comentario: Reprocesa solo las filas nuevas de `source` (nombre del archivo/ruta).
+    Si la huella de las filas ya procesadas no coincide, hace la carga completa.
+    El resultado queda en df.attrs["ingestao"] = {"modo", "linhas_novas", "linhas"}.
+    """
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    data_path = _state_path(state_dir, source, sheet_name)
+
+    # Comentario: El XLSX es un zip de XML: no hay acceso aleatorio a filas, así que se lee
+    # una sola vez en streaming (columnas clave + datos) y solo la cola pasa por `process`
+    raw = read_sheet(file_bytes, sheet_name, DATA_COLUMNS)
+    keys = raw[[c for c in KEY_COLUMNS if c in raw.columns]]
+    n_rows = len(raw)
+
+    stored = None
+    if data_path.exists():
+        try:
+            # Comentario: Dos uploads con el mismo nombre pueden pisarse el estado, pero datos y
+            # huella están en el mismo archivo (siempre del mismo Excel): si no coincide, carga completa
+            meta = read_state(data_path)
+            n_old = int(meta["rows"])
+            if n_old <= n_rows and fingerprint(keys.iloc[:n_old]) == meta["fingerprint"]:
+                stored = read_frame(data_path), n_old
+        except Exception:
+            stored = None
+
+    if stored is not None:
+        df_old, n_old = stored
+        if n_old == n_rows:
+            df, modo, novas = df_old, "incremental", 0
+        else:
+            tail = process(raw.iloc[n_old:].reset_index(drop=True))
+            df = _append(df_old, tail) if len(tail) else df_old
+            modo, novas = "incremental", n_rows - n_old
+    else:
+        df = process(raw)
+        modo, novas = "completo", n_rows
+
+    df.attrs["ingestao"] = {"modo": modo, "linhas_novas": int(novas), "linhas": int(n_rows)}
+
+    try:
+        write_frame(data_path, df, {"rows": n_rows, "fingerprint": fingerprint(keys)})
+        evict(state_dir, max_bytes)
+    except Exception:
+        pass
+    return df
@@ -0,0 +1,106 @@
+# Ingestión en segundo plano (pool de threads del proceso)
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+# Comentario: Etapas en orden (clave, rótulo); el progreso es la posición en la lista
+ETAPAS = (
+    ("fila", "Na fila"),
+    ("lendo", "Lendo o Excel"),
+    ("normalizando", "Validando e normalizando"),
+    ("enriquecendo", "Calculando m²"),
+    ("indexando", "Montando índices"),
+    ("pronto", "Pronto"),
+)
+_ORDEM = {k: i for i, (k, _) in enumerate(ETAPAS)}
+DEFAULT_WORKERS = 4
+JOB_TTL = 3600  # Comentario: segundos que un job terminado espera a que su sesión lo recoja
+
+_atual = threading.local()
+
+
+def report_stage(etapa: str) -> None:
+    # Comentario: Llamado desde el pipeline; fuera de un job no hace nada
+    job = getattr(_atual, "job", None)
+    if job is not None and _ORDEM[etapa] > _ORDEM[job.etapa]:
+        job.set_etapa(etapa)
+
+
+class Job:
+    def __init__(self, descricao: str):
+        self.id = uuid.uuid4().hex
+        self.descricao = descricao
+        self.etapa = "fila"
+        self.erro: str | None = None
+        self.resultado = None
+        self.inicio = time.monotonic()
+        self.fim: float | None = None
+        self.marcas: list[tuple[str, float]] = [("fila", self.inicio)]  # Comentario: (etapa, inicio) para el perfil
+
+    def set_etapa(self, etapa: str) -> None:
+        self.etapa = etapa
+        self.marcas.append((etapa, time.monotonic()))
+
+    @property
+    def done(self) -> bool:
+        return self.fim is not None
+
+    @property
+    def progresso(self) -> float:
+        return _ORDEM[self.etapa] / (len(ETAPAS) - 1)
+
+    @property
+    def rotulo(self) -> str:
+        return dict(ETAPAS)[self.etapa]
+
+
+class JobManager:
+    """
+    Comentario: Corre la ingestión fuera del script de Streamlit. El rerun solo consulta el
+    estado del job (etapa / error / resultado), así el script nunca queda bloqueado
+    leyendo el Excel. `parallel` lanza sub-tareas (ej. metas) en un pool aparte: un job
+    esperando su sub-tarea nunca ocupa el lugar que ella necesita.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestao")
+        self._aux = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestao-aux")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+
+    def submit(self, descricao: str, fn: Callable[[], object]) -> Job:
+        job = Job(descricao)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn)
+        return job
+
+    def parallel(self, fn: Callable, *args) -> Future:
+        return self._aux.submit(fn, *args)
+
+    def _run(self, job: Job, fn: Callable[[], object]) -> None:
+        _atual.job = job
+        job.set_etapa("lendo")
+        try:
+            job.resultado = fn()
+            job.set_etapa("pronto")
+        except Exception as e:
+            job.erro = str(e)
+        finally:
+            _atual.job = None
+            job.fim = time.monotonic()
+
+    def get(self, job_id: str) -> Job | None:
+        # Comentario: Los jobs terminados no se borran al leerlos (varias sesiones pueden esperar el mismo);
+        # los vencidos se podan aquí también (sin nuevos uploads `submit` no correría)
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        limite = time.monotonic() - JOB_TTL
+        for k in [k for k, j in self._jobs.items() if j.done and j.fim < limite]:
+            del self._jobs[k]
@@ -0,0 +1,34 @@
+# Grafo de cálculo memoizado por sesión (reruns parciales)
+from typing import Callable
+
+
+class Memo:
+    """
+    Comentario: {nodo: (clave, valor)}, un solo valor por nodo (el del último estado).
+    La clave de cada nodo se arma con las claves de sus entradas (base, filtros, widgets
+    propios), así un widget solo recalcula los nodos aguas abajo de él; el resto del rerun
+    devuelve lo ya calculado. Las claves se comparan con == (objetos sin __eq__, como un
+    MetasIndex, por identidad: el Memo los retiene, el id no se reutiliza).
+    """
+
+    def __init__(self):
+        self._nos: dict[str, tuple[object, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, no: str, chave, build: Callable[[], object]):
+        atual = self._nos.get(no)
+        if atual is not None and atual[0] == chave:
+            self.hits += 1
+            return atual[1]
+        self.misses += 1
+        valor = build()
+        self._nos[no] = (chave, valor)
+        return valor
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        self._nos.clear()
@@ -0,0 +1,144 @@
+# Metas
+from functools import lru_cache
+from typing import NamedTuple
+
+import pandas as pd
+
+# Comentario: Jerarquía de resolución (de la más específica a la más general)
+ORDEM_NIVEIS = ("Equipe", "Supervisor", "Encarregado", "Tipo", "Geral")
+
+
+class Vigencia(NamedTuple):
+    prioridade: int
+    ativo_de: object    # Comentario: date o None (= sin límite)
+    ativo_ate: object
+    meta: float
+
+
+def _date_or_none(v):
+    return None if pd.isna(v) else v
+
+
+class MetasIndex:
+    """
+    Comentario: Tabla de metas compilada una vez al cargar:
+    {(Metrica, Periodo, Nivel, Referencia): [Vigencia, ...]} ordenada por Prioridade.
+    resolve() queda memoizado por (contexto, d1, d2), así cambiar filtros cuesta
+    búsquedas en diccionario en lugar de recorrer el DataFrame.
+    """
+
+    def __init__(self, df_metas: pd.DataFrame | None, cache_size: int = 4096):
+        self.tabela: dict[tuple[str, str, str, str], list[Vigencia]] = {}
+        if df_metas is not None and not df_metas.empty:
+            cols = ["Metrica", "Periodo", "Nivel", "Referencia", "Prioridade", "Ativo de", "Ativo até", "Meta"]
+            # Comentario: Orden estable por Prioridade (empates: orden de la planilla)
+            ordenado = df_metas[cols].sort_values("Prioridade", kind="stable")
+            for metrica, periodo, nivel, ref, prio, de, ate, meta in ordenado.itertuples(index=False, name=None):
+                chave = (metrica, periodo, nivel, ref)
+                self.tabela.setdefault(chave, []).append(
+                    Vigencia(int(prio), _date_or_none(de), _date_or_none(ate), float(meta))
+                )
+        self._resolve = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+
+    def __bool__(self) -> bool:
+        return bool(self.tabela)
+
+    def candidatos(self, metrica: str, periodo: str, nivel: str, referencia: str) -> list[Vigencia]:
+        return self.tabela.get((metrica, periodo, nivel, referencia), [])
+
+    def _resolve_uncached(self, contexto: tuple, d1, d2, metrica: str, periodo: str) -> float | None:
+        ctx = dict(contexto)
+        for nivel in ORDEM_NIVEIS:
+            ref = "ALL" if nivel == "Geral" else ctx.get(nivel)
+            if not ref:
+                continue
+            for v in self.candidatos(metrica, periodo, nivel, str(ref).strip()):
+                # Comentario: Vigente si la ventana [Ativo de, Ativo até] se cruza con [d1, d2]
+                if (v.ativo_de is None or v.ativo_de <= d2) and (v.ativo_ate is None or v.ativo_ate >= d1):
+                    return v.meta
+        return None
+
+    def resolve(self, contexto: dict, d1, d2, metrica: str = "m2_total", periodo: str = "Dia") -> float | None:
+        """
+        Comentario: Devuelve la meta según jerarquía:
+        Equipe > Supervisor > Encarregado > Tipo > Geral
+        """
+        if not self.tabela:
+            return None
+        chave = tuple(sorted((k, str(v)) for k, v in contexto.items() if v))
+        return self._resolve(chave, d1, d2, metrica, periodo)
+
+
+# =========================
+# Metas por (DATA, EQUIPE) en lote
+# =========================
+# Comentario: Columna de la base que alimenta cada nivel (Tipo no existe en el formulario)
+NIVEL_COLUNA = {"Equipe": "EQUIPE", "Supervisor": "SUPERVISOR", "Encarregado": "NOME DO ENCARREGADO"}
+
+
+def daily_team_goals(cube: pd.DataFrame, df_metas: pd.DataFrame | None,
+                     metrica: str = "m2_total", periodo: str = "Dia") -> pd.DataFrame:
+    """
+    Comentario: Para cada par (DATA, EQUIPE) del cubo: m² producido, meta diaria aplicable
+    (jerarquía Equipe > Supervisor > Encarregado > Geral, vigencia evaluada en la propia DATA)
+    y atingimento (%). Un join vectorizado por nivel, sin recorrer meta por meta.
+    El Supervisor/Encarregado del par es el de mayor m² ese día.
+    """
+    ctx_cols = [c for c in NIVEL_COLUNA.values() if c in cube.columns and c != "EQUIPE"]
+    base = cube.sort_values(metrica, ascending=False, kind="stable")
+    pares = base.groupby(["DATA", "EQUIPE"], observed=True, sort=True).agg(
+        m2=(metrica, "sum"), **{c: (c, "first") for c in ctx_cols}
+    ).reset_index()
+    pares["EQUIPE"] = pares["EQUIPE"].astype(str)
+    pares["_dia"] = pd.to_datetime(pares["DATA"])
+    pares["meta"] = float("nan")
+    pares["nivel_meta"] = None
+
+    if df_metas is not None and not df_metas.empty and len(pares):
+        m = df_metas[(df_metas["Metrica"] == metrica) & (df_metas["Periodo"] == periodo)]
+        m = m.assign(
+            _de=pd.to_datetime(m["Ativo de"], errors="coerce"),
+            _ate=pd.to_datetime(m["Ativo até"], errors="coerce"),
+        )[["Nivel", "Referencia", "Prioridade", "_de", "_ate", "Meta"]]
+        pares["_par"] = range(len(pares))
+
+        for nivel in ORDEM_NIVEIS:
+            faltam = pares["meta"].isna()
+            if not faltam.any():
+                break
+            if nivel == "Geral":
+                refs = pd.Series("ALL", index=pares.index)
+            elif nivel in NIVEL_COLUNA and NIVEL_COLUNA[nivel] in pares.columns:
+                refs = pares[NIVEL_COLUNA[nivel]].astype(str).str.strip()
+            else:
+                continue
+            cand = m[m["Nivel"] == nivel]
+            if cand.empty:
+                continue
+            left = pd.DataFrame({"_par": pares["_par"], "_dia": pares["_dia"], "Referencia": refs})[faltam]
+            j = left.merge(cand, on="Referencia", how="inner")
+            j = j[(j["_de"].isna() | (j["_de"] <= j["_dia"])) & (j["_ate"].isna() | (j["_ate"] >= j["_dia"]))]
+            if j.empty:
+                continue
+            # Comentario: Menor Prioridade gana (empate: orden de la planilla)
+            j = j.sort_values("Prioridade", kind="stable").drop_duplicates("_par")
+            pares.loc[j["_par"].to_numpy(), "meta"] = j["Meta"].to_numpy()
+            pares.loc[j["_par"].to_numpy(), "nivel_meta"] = nivel
+        pares = pares.drop(columns="_par")
+
+    pares["atingimento"] = pares["m2"] / pares["meta"] * 100
+    return pares.drop(columns="_dia")
+
+
+def team_goal_summary(pares: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: Resumen por equipe: días con meta, días atingidos, atingimento medio
+    com_meta = pares[pares["meta"].notna()]
+    if com_meta.empty:
+        return pd.DataFrame(columns=["EQUIPE", "Dias com meta", "Dias atingidos", "Atingimento médio (%)"])
+    g = com_meta.assign(_ok=com_meta["m2"] >= com_meta["meta"]).groupby("EQUIPE")
+    out = pd.DataFrame({
+        "Dias com meta": g.size(),
+        "Dias atingidos": g["_ok"].sum().astype(int),
+        "Atingimento médio (%)": g["atingimento"].mean().round(1),
+    }).reset_index()
+    return out.sort_values("Atingimento médio (%)", kind="stable")
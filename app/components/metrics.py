@@ -1 +1,173 @@
 # KPIs
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class Frente(NamedTuple):
+    coluna: str         # Comentario: columna de salida (m² de la frente)
+    sufixo: str         # Comentario: sufijo de las columnas del formulario, ej. "KM INICIAL (Trator A)"
+    grupo: str          # Comentario: rótulo en la composición (Manual / Tratores / Robô)
+    coluna_grupo: str   # Comentario: columna agregada del grupo (igual a `coluna` si la frente está sola)
+
+    @property
+    def campos(self) -> tuple[str, str, str]:
+        return (
+            f"KM INICIAL ({self.sufixo})",
+            f"KM FINAL ({self.sufixo})",
+            f"LARGURA (média) ({self.sufixo})",
+        )
+
+
+# Comentario: Tabla declarativa de frentes. Una frente nueva = una fila nueva aquí
+# (el lector, el motor de m² y la composición se derivan de esta tabla).
+FRONTS = (
+    Frente("m2_manual", "Roçada Manual", "Manual", "m2_manual"),
+    Frente("m2_trator_a", "Trator A", "Tratores", "m2_tratores"),
+    Frente("m2_trator_b", "Trator B", "Tratores", "m2_tratores"),
+    Frente("m2_trator_c", "Trator C", "Tratores", "m2_tratores"),
+    Frente("m2_robo", "Robô", "Robô", "m2_robo"),
+)
+TOTAL_COLUMN = "m2_total"
+
+
+def input_columns(fronts=FRONTS) -> list[str]:
+    # Comentario: Columnas KM/LARGURA del formulario que alimentan el motor
+    return [c for f in fronts for c in f.campos]
+
+
+def group_columns(fronts=FRONTS) -> dict[str, str]:
+    # Comentario: {rótulo del grupo: columna}, en el orden de la tabla
+    out: dict[str, str] = {}
+    for f in fronts:
+        out.setdefault(f.grupo, f.coluna_grupo)
+    return out
+
+
+def m2_columns(fronts=FRONTS) -> list[str]:
+    # Comentario: Todas las columnas que produce enrich_m2 (frentes, grupos, total)
+    cols = [f.coluna for f in fronts]
+    cols += [c for c in group_columns(fronts).values() if c not in cols]
+    return cols + [TOTAL_COLUMN]
+
+
+def _coerce_into(out: np.ndarray, s: pd.Series | None) -> None:
+    # Comentario: Copia la columna en la fila de la matriz; texto no numérico → NaN
+    if s is None:
+        out.fill(np.nan)
+    elif pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        out[:] = s.to_numpy(dtype=out.dtype, na_value=np.nan)
+    else:
+        out[:] = pd.to_numeric(s, errors="coerce").to_numpy(dtype=out.dtype, na_value=np.nan)
+
+
+def compute_m2(df: pd.DataFrame, fronts=FRONTS, dtype="float64") -> pd.DataFrame:
+    """
+    Comentario: m² = |Δkm| * 1000 * ancho(m) para todas las frentes de una vez.
+    Devuelve un DataFrame (mismo índice) con m2_<frente>, m2_<grupo> y m2_total,
+    respaldado por un único bloque NumPy.
+    """
+    n = len(df)
+    nf = len(fronts)
+    grupos = {c: [i for i, f in enumerate(fronts) if f.coluna_grupo == c]
+              for c in group_columns(fronts).values()}
+    grupos = {c: idx for c, idx in grupos.items() if c not in {f.coluna for f in fronts}}
+
+    # Comentario: Matriz contigua (3, frentes, filas): KM INICIAL / KM FINAL / LARGURA
+    entrada = np.empty((3, nf, n), dtype=dtype)
+    for j, f in enumerate(fronts):
+        for k, col in enumerate(f.campos):
+            _coerce_into(entrada[k, j], df.get(col))
+
+    # Comentario: Salida en un solo bloque: frentes, grupos, total
+    res = np.empty((nf + len(grupos) + 1, n), dtype=dtype)
+    m2 = res[:nf]
+    np.subtract(entrada[1], entrada[0], out=m2)
+    np.abs(m2, out=m2)
+    m2 *= 1000
+    m2 *= entrada[2]
+    np.copyto(m2, 0, where=np.isnan(m2))
+    del entrada
+
+    for g, idx in enumerate(grupos.values()):
+        out = res[nf + g]
+        out[:] = m2[idx[0]]
+        for i in idx[1:]:
+            np.add(out, m2[i], out=out)
+    np.sum(m2, axis=0, out=res[-1])
+
+    cols = [f.coluna for f in fronts] + list(grupos) + [TOTAL_COLUMN]
+    return pd.DataFrame(res.T, index=df.index, columns=cols, copy=False)
+
+
+def enrich_m2(df: pd.DataFrame, fronts=FRONTS) -> pd.DataFrame:
+    # Comentario: Calcula m² por frente y total (reemplaza las columnas si ya existían)
+    m2 = compute_m2(df, fronts)
+    base = df.drop(columns=[c for c in m2.columns if c in df.columns])
+    return pd.concat([base, m2], axis=1)
+
+
+# =========================
+# Cubo diario pre-agregado
+# =========================
+CUBE_KEYS = ["DATA", "EQUIPE", "SUPERVISOR", "NOME DO ENCARREGADO"]
+_CUBE_GROUPBY = {"observed": True, "dropna": False, "sort": True}
+
+
+def build_cube(df: pd.DataFrame, fronts=FRONTS, contagens: dict[str, np.ndarray] | None = None) -> pd.DataFrame:
+    """
+    Comentario: Agrega una sola vez (al cargar) por (DATA, EQUIPE, SUPERVISOR, ENCARREGADO):
+    m² sumado por frente/grupo/total + conteo de registros y de registros con m² = 0.
+    `contagens` = otros indicadores por fila a sumar (ej. checagens de calidad).
+    Tendencia, ranking, composición y KPIs se responden desde aquí.
+    """
+    keys = [c for c in CUBE_KEYS if c in df.columns]
+    medidas = [c for c in m2_columns(fronts) if c in df.columns]
+    base = df[keys + medidas].astype({c: "float64" for c in medidas})
+    base["registros"] = np.int64(1)
+    base["registros_zero"] = (df[TOTAL_COLUMN] <= 0).astype("int64")
+    for col, valores in (contagens or {}).items():
+        base[col] = valores
+    cube = base.groupby(keys, **_CUBE_GROUPBY).sum()
+    return cube.reset_index()
+
+
+def cube_cells(df: pd.DataFrame) -> np.ndarray:
+    # Comentario: Para cada fila, la fila del cubo (misma agrupación que build_cube)
+    keys = [c for c in CUBE_KEYS if c in df.columns]
+    return df.groupby(keys, **_CUBE_GROUPBY).ngroup().to_numpy()
+
+
+def kpis(cube: pd.DataFrame) -> dict:
+    # Comentario: KPIs principales desde el cubo (ya filtrado)
+    m2_total = float(cube[TOTAL_COLUMN].sum())
+    dias = int(cube["DATA"].nunique())
+    return {
+        "m2_total": m2_total,
+        "dias": dias,
+        "m2_por_dia": (m2_total / dias) if dias else 0.0,
+        "equipes_ativas": int(cube["EQUIPE"].nunique()) if "EQUIPE" in cube.columns else 0,
+        "registros": int(cube["registros"].sum()),
+        "registros_zero": int(cube["registros_zero"].sum()),
+    }
+
+
+def trend(cube: pd.DataFrame) -> pd.DataFrame:
+    # Comentario: m² por día
+    return cube.groupby("DATA", as_index=False)[TOTAL_COLUMN].sum().sort_values("DATA")
+
+
+def ranking(cube: pd.DataFrame, top: int = 10) -> pd.DataFrame:
+    # Comentario: Top equipes por m²
+    rank = cube.groupby("EQUIPE", as_index=False, observed=True)[TOTAL_COLUMN].sum()
+    return rank.sort_values(TOTAL_COLUMN, ascending=False).head(top)
+
+
+def composition(cube: pd.DataFrame, fronts=FRONTS) -> pd.DataFrame:
+    # Comentario: m² por grupo de frentes (Manual vs Tratores vs Robô)
+    grupos = group_columns(fronts)
+    return pd.DataFrame({
+        "Tipo": list(grupos),
+        "m2": [float(cube[c].sum()) for c in grupos.values()],
+    })
@@ -0,0 +1,148 @@
+# Outliers: sketches de cuantiles por equipe (mergeables)
+import numpy as np
+import pandas as pd
+
+from components.filters import FilteredView, FilterIndex
+from components.metrics import TOTAL_COLUMN, cube_cells
+
+# Comentario: Bins logarítmicos tipo DDSketch: error relativo ≤ ALPHA en cualquier cuantil.
+# El bin 0 guarda los valores ≤ 0 (m² = 0); valores en (0, MIN_VALUE] caen en el bin 1.
+ALPHA = 0.01
+MIN_VALUE = 1e-2
+_LOG_GAMMA = np.log((1 + ALPHA) / (1 - ALPHA))
+_KEY_MIN = int(np.ceil(np.log(MIN_VALUE) / _LOG_GAMMA))
+
+# Comentario: Equipes con pocos registros usan el p95 de toda la selección
+MIN_REGISTROS_EQUIPE = 20
+MAD_Z = 3.5
+
+
+def value_to_bin(values: np.ndarray) -> np.ndarray:
+    v = np.asarray(values, dtype="float64")
+    out = np.zeros(len(v), dtype="int32")
+    pos = v > 0
+    k = np.ceil(np.log(np.maximum(v[pos], MIN_VALUE)) / _LOG_GAMMA).astype("int64")
+    out[pos] = k - _KEY_MIN + 1
+    return out
+
+
+def bin_to_value(bins: np.ndarray) -> np.ndarray:
+    # Comentario: Valor representativo del bin (punto medio relativo)
+    bins = np.asarray(bins)
+    k = bins.astype("float64") + _KEY_MIN - 1
+    rep = 2 * np.exp(k * _LOG_GAMMA) / ((1 + ALPHA) / (1 - ALPHA) + 1)
+    return np.where(bins == 0, 0.0, rep)
+
+
+def _quantile_bins(hist: np.ndarray, q: float) -> np.ndarray:
+    # Comentario: hist (equipes × bins) → bin del cuantil q por fila (-1 si la fila está vacía)
+    n = hist.sum(axis=1)
+    cum = np.cumsum(hist, axis=1)
+    rank = np.floor(q * np.maximum(n - 1, 0))
+    idx = (cum > rank[:, None]).argmax(axis=1)
+    return np.where(n > 0, idx, -1)
+
+
+class OutlierSketch:
+    """
+    Comentario: Por cada celda del cubo (DATA, EQUIPE, SUPERVISOR, ENCARREGADO) y cada columna,
+    un histograma disperso de bins logarítmicos, guardado tipo CSR (celdas ordenadas como el
+    índice del cubo). Filtrar = tomar las celdas seleccionadas y sumar histogramas; p95 y MAD
+    salen de los histogramas sin ordenar filas crudas.
+    El bin 0 (m² = 0) solo entra en TOTAL_COLUMN: en una frente, 0 = frente no usada en ese
+    registro, y con esos ceros una frente poco usada tendría p95 = 0 (todo uso sería outlier).
+    """
+
+    def __init__(self, df: pd.DataFrame, cube_idx: FilterIndex, colunas: tuple[str, ...] = (TOTAL_COLUMN,)):
+        n_cells = len(cube_idx.df)
+        # Comentario: celda original del cubo → posición en el índice (ordenado por DATA)
+        inv = np.empty(n_cells, dtype="int64")
+        inv[cube_idx.order] = np.arange(n_cells)
+        cells = inv[cube_cells(df)]
+
+        equipe = cube_idx.df["EQUIPE"] if "EQUIPE" in cube_idx.df.columns else pd.Series([None] * n_cells)
+        cat = pd.Categorical(equipe)
+        self.equipes = cat.categories
+        cell_team = cat.codes.astype("int64")
+
+        self.n_bins = int(value_to_bin(np.array([1e12]))[0]) + 1
+        self.colunas = {}
+        for col in colunas:
+            if col not in df.columns:
+                continue
+            bins = np.minimum(value_to_bin(df[col].to_numpy()), self.n_bins - 1)
+            code = cells * self.n_bins + bins
+            if col != TOTAL_COLUMN:
+                code = code[bins > 0]
+            uniq, counts = np.unique(code, return_counts=True)
+            e_cell = uniq // self.n_bins
+            self.colunas[col] = {
+                "ptr": np.searchsorted(e_cell, np.arange(n_cells + 1)),
+                "team": cell_team[e_cell].astype("int32"),
+                "bin": (uniq % self.n_bins).astype("int32"),
+                "count": counts.astype("int64"),
+            }
+
+    def _entries(self, col: str, cube_view: FilteredView) -> np.ndarray:
+        # Comentario: Índices de las entradas de las celdas seleccionadas
+        ptr = self.colunas[col]["ptr"]
+        if isinstance(cube_view.rows, slice):
+            return np.arange(ptr[cube_view.rows.start], ptr[cube_view.rows.stop])
+        cells = cube_view.rows
+        starts, ends = ptr[cells], ptr[cells + 1]
+        lens = ends - starts
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lens)[:-1])), lens)
+        return offsets + np.arange(lens.sum())
+
+    def summary(self, cube_view: FilteredView, col: str = TOTAL_COLUMN) -> dict:
+        """
+        Comentario: Para la selección:
+        - p95 global y por equipe (aprox., error relativo ≤ ALPHA);
+        - outliers_p95: registros por encima del p95 de su equipe;
+        - outliers_mad: registros con |x - mediana| / (1.4826·MAD) > MAD_Z (por equipe).
+        """
+        vazio = {"p95": 0.0, "p95_equipe": pd.Series(dtype="float64"), "outliers_p95": 0, "outliers_mad": 0}
+        if col not in self.colunas:
+            return vazio
+        s = self.colunas[col]
+        e = self._entries(col, cube_view)
+        if len(e) == 0:
+            return vazio
+
+        # Comentario: Histograma (equipe × bin); la última fila = registros sin equipe
+        n_teams = len(self.equipes) + 1
+        team = np.where(s["team"][e] < 0, n_teams - 1, s["team"][e])
+        flat = np.bincount(team * self.n_bins + s["bin"][e], weights=s["count"][e],
+                           minlength=n_teams * self.n_bins)
+        hist = flat.reshape(n_teams, self.n_bins)
+        total = hist.sum(axis=0, keepdims=True)
+
+        n_team = hist.sum(axis=1)
+        p95_bin = _quantile_bins(hist, 0.95)
+        p95_global = int(_quantile_bins(total, 0.95)[0])
+        p95_bin = np.where(n_team >= MIN_REGISTROS_EQUIPE, p95_bin, p95_global)
+
+        acima = np.arange(self.n_bins)[None, :] > p95_bin[:, None]
+        outliers_p95 = int(hist[acima].sum())
+
+        # Comentario: MAD por equipe sobre los valores representativos de cada bin
+        rep = bin_to_value(np.arange(self.n_bins))
+        med = rep[np.maximum(_quantile_bins(hist, 0.5), 0)]
+        dev = np.abs(rep[None, :] - med[:, None])
+        order = np.argsort(dev, axis=1)
+        dev_sorted = np.take_along_axis(dev, order, axis=1)
+        hist_sorted = np.take_along_axis(hist, order, axis=1)
+        mad = dev_sorted[np.arange(n_teams), np.maximum(_quantile_bins(hist_sorted, 0.5), 0)]
+        escala = 1.4826 * mad
+        com_mad = (escala > 0) & (n_team >= MIN_REGISTROS_EQUIPE)
+        z = np.divide(dev, escala[:, None], out=np.zeros_like(dev), where=com_mad[:, None])
+        outliers_mad = int(hist[z > MAD_Z].sum())
+
+        p95_equipe = pd.Series(rep[np.maximum(p95_bin[:-1], 0)], index=self.equipes)
+        p95_equipe = p95_equipe[n_team[:-1] > 0]
+        return {
+            "p95": float(rep[max(p95_global, 0)]),
+            "p95_equipe": p95_equipe,
+            "outliers_p95": outliers_p95,
+            "outliers_mad": outliers_mad,
+        }
@@ -0,0 +1,68 @@
+# Particiones por equipe (página de detalle): armadas una vez al cargar la base
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from components.filters import FilterIndex
+from components.metas import daily_team_goals
+from components.metrics import FRONTS, TOTAL_COLUMN
+
+JANELAS = (7, 30)  # Comentario: medias móviles (días de calendario)
+
+
+class TeamPartition(NamedTuple):
+    equipe: str
+    posicoes: np.ndarray    # Comentario: filas de la base (ordenada por DATA) de la equipe, crecientes
+    celulas: np.ndarray     # Comentario: filas del cubo de la equipe (para metas por día)
+    serie: pd.DataFrame     # Comentario: un día por fila (calendario continuo): m² por frente, total, registros, médias
+
+
+def rolling_columns() -> list[str]:
+    return [f"media_{n}d" for n in JANELAS]
+
+
+def _serie(diario: pd.DataFrame, medidas: list[str]) -> pd.DataFrame:
+    # Comentario: Días sin registro = 0 (la media móvil es por día de calendario, no por día con envío)
+    dias = pd.date_range(diario["DATA"].iloc[0], diario["DATA"].iloc[-1], freq="D", unit="ms")
+    serie = diario.set_index("DATA").reindex(dias, fill_value=0)
+    serie.index.name = "DATA"
+    for n, col in zip(JANELAS, rolling_columns()):
+        serie[col] = serie[TOTAL_COLUMN].rolling(n, min_periods=1).mean()
+    return serie[[*medidas, "registros", *rolling_columns()]].reset_index()
+
+
+def build_partitions(df_idx: FilterIndex, cube_idx: FilterIndex) -> dict[str, TeamPartition]:
+    """
+    Comentario: {equipe: TeamPartition}. Las posiciones salen del índice de filtros (ya
+    agrupadas por categoría); la serie diaria, de un solo groupby sobre el cubo. Cambiar de
+    equipe en la página es un acceso al diccionario: no depende del tamaño del histórico.
+    """
+    if "EQUIPE" not in df_idx.posicoes or "EQUIPE" not in cube_idx.posicoes:
+        return {}
+    cube = cube_idx.df
+    medidas = [c for c in [*(f.coluna for f in FRONTS), TOTAL_COLUMN] if c in cube.columns]
+    diario = cube.groupby(["EQUIPE", "DATA"], observed=True, sort=True)[[*medidas, "registros"]].sum()
+    blocos = {str(k): b.droplevel("EQUIPE").reset_index() for k, b in diario.groupby(level="EQUIPE", observed=True)}
+
+    out = {}
+    for equipe, code in df_idx.codigos["EQUIPE"].items():
+        cube_code = cube_idx.codigos["EQUIPE"].get(equipe)
+        if cube_code is None or equipe not in blocos:
+            continue
+        out[equipe] = TeamPartition(equipe, df_idx.posicoes["EQUIPE"][code], cube_idx.posicoes["EQUIPE"][cube_code],
+                                    _serie(blocos[equipe], medidas))
+    return out
+
+
+def team_goals(part: TeamPartition, cube: pd.DataFrame, df_metas: pd.DataFrame | None) -> pd.DataFrame:
+    # Comentario: Meta / atingimento por día de la equipe (solo sus celdas del cubo; metas son de la sesión)
+    return daily_team_goals(cube.iloc[part.celulas], df_metas)
+
+
+def window(serie: pd.DataFrame, d1, d2) -> pd.DataFrame:
+    # Comentario: Recorte del período por búsqueda binaria (la serie está ordenada por DATA)
+    dias = serie["DATA"].to_numpy()
+    lo = np.searchsorted(dias, np.datetime64(pd.Timestamp(d1)), side="left")
+    hi = np.searchsorted(dias, np.datetime64(pd.Timestamp(d2) + pd.Timedelta(days=1)), side="left")
+    return serie.iloc[lo:hi]
@@ -0,0 +1,126 @@
+# Perfil por rerun (opcional): tiempo por etapa y por gráfico, filas y bytes enviados al navegador
+import json
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import pandas as pd
+
+HISTORICO = 20  # Comentario: reruns que la sesión guarda para exportar el trace
+_TIDS = {"etapa": 1, "grafico": 1, "ingestao": 2}
+_HILOS = {1: "rerun", 2: "ingestão (job)"}
+
+
+class Span(NamedTuple):
+    nome: str
+    categoria: str
+    inicio_us: int  # Comentario: µs desde epoch (los reruns quedan en una misma línea de tiempo)
+    dur_us: int
+    linhas: int | None
+    bytes: int | None
+
+
+def payload_bytes(obj) -> int:
+    # Comentario: Estimación de lo que viaja al navegador: spec Vega-Lite como JSON, tabla por su memoria
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=False, deep=True).sum())
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    return len(json.dumps(obj, default=str).encode("utf-8"))
+
+
+class Medida:
+    # Comentario: Lo que el bloque medido informa además del tiempo
+    def __init__(self):
+        self.linhas: int | None = None
+        self.bytes: int | None = None
+
+    def rows(self, n: int) -> None:
+        self.linhas = int(n)
+
+    def sent(self, obj) -> None:
+        self.bytes = (self.bytes or 0) + payload_bytes(obj)
+
+
+class _MedidaNula(Medida):
+    # Comentario: Perfil desactivado: no mide ni serializa nada
+    def rows(self, n: int) -> None:
+        pass
+
+    def sent(self, obj) -> None:
+        pass
+
+
+_NULA = _MedidaNula()
+
+
+class RerunProfiler:
+    """
+    Comentario: Spans de un rerun del script. `with prof.stage("filtros") as m: ...; m.rows(n)`.
+    Desactivado, `stage` no toma tiempos ni calcula bytes (costo ~nulo en producción).
+    """
+
+    def __init__(self, ativo: bool, rerun: int = 0):
+        self.ativo = ativo
+        self.rerun = rerun
+        self.spans: list[Span] = []
+        self.fechado = False
+        self._t0 = time.perf_counter()
+        self._epoch_us = time.time_ns() // 1000
+
+    def _us(self, t: float) -> int:
+        return self._epoch_us + int((t - self._t0) * 1e6)
+
+    @contextmanager
+    def stage(self, nome: str, categoria: str = "etapa"):
+        if not self.ativo:
+            yield _NULA
+            return
+        medida = Medida()
+        t0 = time.perf_counter()
+        try:
+            yield medida
+        finally:
+            t1 = time.perf_counter()
+            self.spans.append(Span(nome, categoria, self._us(t0), int((t1 - t0) * 1e6), medida.linhas, medida.bytes))
+
+    def add_job(self, job) -> None:
+        # Comentario: Etapas del job de ingestión (reloj monotónico del proceso → epoch)
+        if not self.ativo or job.fim is None or not job.marcas:
+            return
+        ancla_us = time.time_ns() // 1000 - int((time.monotonic() - job.fim) * 1e6)
+        marcas = [*job.marcas, ("fim", job.fim)]
+        for (etapa, t), (_, prox) in zip(marcas, marcas[1:]):
+            inicio = ancla_us - int((job.fim - t) * 1e6)
+            self.spans.append(Span(etapa, "ingestao", inicio, int((prox - t) * 1e6), None, None))
+
+    def close(self) -> None:
+        # Comentario: Span del rerun completo (filas = None; bytes = suma de lo medido)
+        self.fechado = True
+        if not self.ativo:
+            return
+        enviados = sum(s.bytes or 0 for s in self.spans if s.categoria != "ingestao")
+        self.spans.append(Span("total", "etapa", self._epoch_us, int((time.perf_counter() - self._t0) * 1e6),
+                               None, enviados))
+
+    def table(self) -> pd.DataFrame:
+        linhas = [{"etapa": s.nome, "tipo": s.categoria, "ms": round(s.dur_us / 1000, 1),
+                   "linhas": s.linhas, "bytes": s.bytes} for s in self.spans]
+        return pd.DataFrame(linhas, columns=["etapa", "tipo", "ms", "linhas", "bytes"]).astype(
+            {"linhas": "Int64", "bytes": "Int64"})
+
+
+def chrome_trace(perfis: list[RerunProfiler]) -> dict:
+    # Comentario: Formato "Trace Event" (chrome://tracing, Perfetto): un evento "X" por span
+    eventos = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": nome}}
+               for tid, nome in _HILOS.items()]
+    for p in perfis:
+        for s in p.spans:
+            args = {"rerun": p.rerun}
+            if s.linhas is not None:
+                args["linhas"] = s.linhas
+            if s.bytes is not None:
+                args["bytes"] = s.bytes
+            eventos.append({"name": s.nome, "cat": s.categoria, "ph": "X", "ts": s.inicio_us, "dur": s.dur_us,
+                            "pid": 1, "tid": _TIDS.get(s.categoria, 1), "args": args})
+    return {"traceEvents": eventos, "displayTimeUnit": "ms"}
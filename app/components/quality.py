@@ -0,0 +1,90 @@
+# Calidad de datos: validación única en la carga
+import numpy as np
+import pandas as pd
+
+from components.metrics import FRONTS, input_columns
+from components.reader import NON_NUMERIC_COLUMN
+
+QC_COLUMN = "qc_flags"
+
+# Comentario: Bits de qc_flags (uint8). Una fila puede tener varios bits prendidos.
+KM_NAO_NUMERICO = 1       # Comentario: KM/LARGURA con texto no numérico (el motor lo toma como 0)
+KM_INVERTIDO = 2          # Comentario: KM FINAL < KM INICIAL en alguna frente
+LARGURA_IMPLAUSIVEL = 4   # Comentario: largura ≤ 0 o > LARGURA_MAX
+DUPLICADO = 8             # Comentario: mismo envío repetido (solo cambia el carimbo)
+
+LARGURA_MAX = 20.0  # Comentario: metros; más ancho que esto no es una faixa de roçada
+
+# Comentario: {bit: (columna de conteo en el cubo, rótulo)}
+CHECAGENS = {
+    KM_NAO_NUMERICO: ("qc_km_nao_numerico", "KM/largura não numérico"),
+    KM_INVERTIDO: ("qc_km_invertido", "KM final < KM inicial"),
+    LARGURA_IMPLAUSIVEL: ("qc_largura_implausivel", f"Largura ≤ 0 ou > {LARGURA_MAX:g} m"),
+    DUPLICADO: ("qc_duplicado", "Envio duplicado"),
+}
+
+# Comentario: Registro duplicado = mismas claves y mismas medidas (el carimbo no cuenta)
+DUP_KEYS = ["DATA", "EQUIPE", "NOME DO ENCARREGADO", "SUPERVISOR"]
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    s = df.get(col)
+    if s is None:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _non_numeric(df: pd.DataFrame, fronts=FRONTS) -> np.ndarray:
+    # Comentario: Si viene del lector en streaming ya está marcado; si no, se compara crudo vs convertido
+    if NON_NUMERIC_COLUMN in df.columns:
+        return df[NON_NUMERIC_COLUMN].to_numpy(dtype=bool)
+    out = np.zeros(len(df), dtype=bool)
+    for col in input_columns(fronts):
+        s = df.get(col)
+        if s is None or pd.api.types.is_numeric_dtype(s.dtype):
+            continue
+        cheio = s.notna().to_numpy() & (s.astype(str).str.strip() != "").to_numpy()
+        out |= cheio & np.isnan(_numeric(df, col))
+    return out
+
+
+def validate_rows(df: pd.DataFrame, fronts=FRONTS) -> pd.DataFrame:
+    """
+    Comentario: Calcula qc_flags por fila (vectorizado) con las checagens de KM y largura.
+    Corre antes de normalizar DATA / calcular m²; no cambia ningún valor.
+    """
+    flags = np.zeros(len(df), dtype="uint8")
+    flags[_non_numeric(df, fronts)] |= KM_NAO_NUMERICO
+    for f in fronts:
+        ini, fim, lar = (_numeric(df, c) for c in f.campos)
+        with np.errstate(invalid="ignore"):
+            flags[fim < ini] |= KM_INVERTIDO
+            flags[(lar <= 0) | (lar > LARGURA_MAX)] |= LARGURA_IMPLAUSIVEL
+    df = df.drop(columns=[NON_NUMERIC_COLUMN], errors="ignore")
+    df[QC_COLUMN] = flags
+    return df
+
+
+def mark_duplicates(df: pd.DataFrame, fronts=FRONTS) -> pd.DataFrame:
+    # Comentario: Sobre la base completa (también en la carga incremental): el primer envío queda limpio
+    if QC_COLUMN not in df.columns or df.empty:
+        return df
+    cols = [c for c in DUP_KEYS + input_columns(fronts) if c in df.columns]
+    dup = df.duplicated(subset=cols, keep="first").to_numpy()
+    flags = df[QC_COLUMN].to_numpy(dtype="uint8") & np.uint8(~DUPLICADO & 0xFF)
+    flags[dup] |= DUPLICADO
+    df[QC_COLUMN] = flags
+    return df
+
+
+def flag_counts(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    # Comentario: Indicadores 0/1 por checagem, para que build_cube los sume por celda
+    if QC_COLUMN not in df.columns:
+        return {}
+    flags = df[QC_COLUMN].to_numpy(dtype="uint8")
+    return {col: ((flags & bit) > 0).astype("int64") for bit, (col, _) in CHECAGENS.items()}
+
+
+def quality_totals(cube: pd.DataFrame) -> dict[str, int]:
+    # Comentario: {rótulo: registros} desde las columnas qc_* del cubo (ya filtrado)
+    return {rotulo: int(cube[col].sum()) for col, rotulo in CHECAGENS.values() if col in cube.columns}
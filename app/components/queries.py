@@ -0,0 +1,148 @@
+# Consultas del tablero (filtros + agregaciones): pandas sobre el cubo o DuckDB sobre la base
+import threading
+
+import pandas as pd
+
+from components.filters import FilteredView
+from components.metrics import TOTAL_COLUMN, composition, group_columns, kpis, ranking, trend
+from components.quality import CHECAGENS, QC_COLUMN, quality_totals
+
+QUERY_BACKENDS = ("pandas", "duckdb")
+DEFAULT_BACKEND = "pandas"
+TABELA = "base"
+
+
+class PandasView:
+    # Comentario: Respuestas desde el cubo ya filtrado por el FilterIndex (camino original)
+    def __init__(self, cube_view: FilteredView):
+        self._cube = cube_view.frame()
+
+    def kpis(self) -> dict:
+        return kpis(self._cube)
+
+    def trend(self) -> pd.DataFrame:
+        return trend(self._cube)
+
+    def ranking(self, top: int = 10) -> pd.DataFrame:
+        return ranking(self._cube, top=top)
+
+    def composition(self) -> pd.DataFrame:
+        return composition(self._cube)
+
+    def quality_totals(self) -> dict[str, int]:
+        return quality_totals(self._cube)
+
+
+class PandasQueries:
+    nome = "pandas"
+
+    def view(self, d1, d2, selecoes: dict[str, list], cube_view: FilteredView) -> PandasView:
+        return PandasView(cube_view)
+
+
+class DuckDBView:
+    """
+    Comentario: Una selección compilada a WHERE (período + dimensiones, con parámetros).
+    Cada agregación es un SELECT sobre la base registrada; DuckDB filtra y agrega en paralelo.
+    """
+
+    def __init__(self, queries: "DuckDBQueries", where: str, params: list):
+        self._q = queries
+        self._where = where
+        self._params = params
+
+    def _sql(self, select: str, resto: str = "") -> pd.DataFrame:
+        return self._q.execute(f"SELECT {select} FROM {TABELA} WHERE {self._where} {resto}", self._params)
+
+    def kpis(self) -> dict:
+        r = self._sql(f"""
+            COALESCE(SUM(CAST("{TOTAL_COLUMN}" AS DOUBLE)), 0) AS m2_total,
+            COUNT(DISTINCT "DATA") AS dias,
+            COUNT(DISTINCT "EQUIPE") AS equipes_ativas,
+            COUNT(*) AS registros,
+            COUNT(*) FILTER (WHERE "{TOTAL_COLUMN}" <= 0) AS registros_zero
+        """).iloc[0]
+        m2_total, dias = float(r["m2_total"]), int(r["dias"])
+        return {
+            "m2_total": m2_total,
+            "dias": dias,
+            "m2_por_dia": (m2_total / dias) if dias else 0.0,
+            "equipes_ativas": int(r["equipes_ativas"]) if self._q.tem_equipe else 0,
+            "registros": int(r["registros"]),
+            "registros_zero": int(r["registros_zero"]),
+        }
+
+    def trend(self) -> pd.DataFrame:
+        return self._sql(f'"DATA", SUM(CAST("{TOTAL_COLUMN}" AS DOUBLE)) AS "{TOTAL_COLUMN}"',
+                         'GROUP BY "DATA" ORDER BY "DATA"')
+
+    def ranking(self, top: int = 10) -> pd.DataFrame:
+        return self._sql(f'CAST("EQUIPE" AS VARCHAR) AS "EQUIPE", SUM(CAST("{TOTAL_COLUMN}" AS DOUBLE)) AS "{TOTAL_COLUMN}"',
+                         f'AND "EQUIPE" IS NOT NULL GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT {int(top)}')
+
+    def composition(self) -> pd.DataFrame:
+        grupos = group_columns()
+        somas = ", ".join(f'COALESCE(SUM(CAST("{c}" AS DOUBLE)), 0)' for c in grupos.values())
+        r = self._sql(somas).iloc[0]
+        return pd.DataFrame({"Tipo": list(grupos), "m2": [float(v) for v in r]})
+
+    def quality_totals(self) -> dict[str, int]:
+        if not self._q.tem_qc:
+            return {}
+        somas = ", ".join(f'COUNT(*) FILTER (WHERE ("{QC_COLUMN}" & {bit}) <> 0)' for bit in CHECAGENS)
+        r = self._sql(somas).iloc[0]
+        return {rotulo: int(v) for (_, rotulo), v in zip(CHECAGENS.values(), r)}
+
+
+class DuckDBQueries:
+    """
+    Comentario: La base compacta copiada (una vez, por Arrow) a una tabla DuckDB en memoria,
+    comprimida por columnas. Como la base viene ordenada por DATA, el filtro de período
+    descarta row groups enteros por sus min/max. La conexión es de la base (compartida
+    entre sesiones); cada consulta usa su propio cursor (thread-safe).
+    """
+    nome = "duckdb"
+
+    def __init__(self, df: pd.DataFrame, threads: int | None = None):
+        import duckdb
+
+        self._con = duckdb.connect()
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        self._con.register("_carga", df)
+        self._con.execute(f"CREATE TABLE {TABELA} AS SELECT * FROM _carga")
+        self._con.unregister("_carga")
+        self._lock = threading.Lock()
+        self.colunas = set(df.columns)
+        self.tem_equipe = "EQUIPE" in self.colunas
+        self.tem_qc = QC_COLUMN in self.colunas
+
+    def execute(self, sql: str, params: list) -> pd.DataFrame:
+        with self._lock:
+            cur = self._con.cursor()
+        try:
+            return cur.execute(sql, params).df()
+        finally:
+            cur.close()
+
+    def view(self, d1, d2, selecoes: dict[str, list], cube_view: FilteredView | None = None) -> DuckDBView:
+        # Comentario: Mismo criterio que FilterIndex.select: período cerrado, lista vacía = sin filtro,
+        # valores comparados como texto
+        where = ['"DATA" >= ?', '"DATA" < ?']
+        params: list = [pd.Timestamp(d1).to_pydatetime(), (pd.Timestamp(d2) + pd.Timedelta(days=1)).to_pydatetime()]
+        for dim, valores in selecoes.items():
+            if not valores or dim not in self.colunas:
+                continue
+            where.append(f'CAST("{dim}" AS VARCHAR) IN ({", ".join("?" * len(valores))})')
+            params += [str(v) for v in valores]
+        return DuckDBView(self, " AND ".join(where), params)
+
+
+def make_queries(backend: str, df: pd.DataFrame) -> PandasQueries | DuckDBQueries:
+    # Comentario: DuckDB es opcional: si no está instalado se usa pandas (el tablero avisa por `nome`)
+    if backend == "duckdb":
+        try:
+            return DuckDBQueries(df)
+        except ImportError:
+            pass
+    return PandasQueries()
@@ -0,0 +1,165 @@
+# Lector XLSX en streaming (openpyxl read-only, sin DOM del libro)
+import io
+import math
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from components.metrics import input_columns
+
+# Comentario: Solo las columnas usadas por enrich_m2, normalize_date_column y los filtros
+NUMERIC_COLUMNS = input_columns()
+DIMENSION_COLUMNS = ["SUPERVISOR", "NOME DO ENCARREGADO", "EQUIPE"]
+TIMESTAMP_COLUMNS = ["Carimbo de data/hora"]
+DATA_COLUMNS = [*TIMESTAMP_COLUMNS, "DATA", *DIMENSION_COLUMNS, *NUMERIC_COLUMNS]
+# Comentario: Columna extra (bool): la fila tiene alguna celda numérica con texto no convertible
+NON_NUMERIC_COLUMN = "_nao_numerico"
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def _to_float(v) -> float:
+    # Comentario: Misma semántica que pd.to_numeric(errors="coerce") para celdas de Excel
+    if v is None or isinstance(v, bool):
+        return math.nan
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, str):
+        v = v.strip()
+        if not v or "_" in v:
+            return math.nan
+        try:
+            return float(v)
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def _is_blank(v) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def _open_rows(file_bytes: bytes, sheet_name: str, columns: list[str]) -> tuple[dict, Iterator[tuple], "openpyxl.Workbook"]:
+    # Comentario: Devuelve {columna: índice dentro de la ventana leída} y el iterador de filas.
+    # Solo se recorre la ventana [primera, última] columna pedida (menos celdas creadas).
+    wb = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    if sheet_name not in wb.sheetnames:
+        wb.close()
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    ws = wb[sheet_name]
+    header = next(ws.iter_rows(max_row=1, values_only=True), ())
+    wanted = set(columns)
+    pos = {}
+    for i, h in enumerate(header):
+        if h is not None and str(h) in wanted and str(h) not in pos:
+            pos[str(h)] = i
+    if not pos:
+        return {}, iter(()), wb
+    lo, hi = min(pos.values()), max(pos.values())
+    rows = ws.iter_rows(min_row=2, min_col=lo + 1, max_col=hi + 1, values_only=True)
+    # Comentario: Filas vacías (en la ventana leída) no cuentan, igual que read_excel
+    rows = (r for r in rows if any(v is not None for v in r))
+    return {c: i - lo for c, i in pos.items()}, rows, wb
+
+
+def iter_chunks(
+    file_bytes: bytes,
+    sheet_name: str,
+    columns: Iterable[str] = DATA_COLUMNS,
+    skip_rows: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    meta: dict | None = None,
+) -> Iterator[dict]:
+    """
+    Comentario: Recorre la aba fila a fila y entrega bloques {columna: valores}.
+    Numéricas → array float64, dimensiones → códigos int32, el resto → lista de objetos.
+    Si hay numéricas, NON_NUMERIC_COLUMN marca las filas con alguna celda no vacía que no
+    se pudo convertir (la conversión la deja en NaN, igual que antes).
+    En `meta` quedan las columnas encontradas y el diccionario de categorías
+    (compartido entre bloques, así los códigos son estables).
+    """
+    columns = list(columns)
+    meta = {} if meta is None else meta
+    pos, rows, wb = _open_rows(file_bytes, sheet_name, columns)
+    try:
+        cols = [c for c in columns if c in pos]
+        categorias = {c: {} for c in cols if c in DIMENSION_COLUMNS}
+        meta["colunas"] = cols
+        meta["categorias"] = categorias
+
+        rows = islice(rows, skip_rows, None)
+        idx = [pos[c] for c in cols]
+        while True:
+            # Comentario: Se guardan solo las celdas pedidas, no la fila entera
+            bloco = [[r[i] if i < len(r) else None for i in idx] for r in islice(rows, chunk_rows)]
+            if not bloco:
+                break
+            chunk = {}
+            invalido = None
+            for j, c in enumerate(cols):
+                vals = (r[j] for r in bloco)
+                if c in NUMERIC_COLUMNS:
+                    arr = np.fromiter(map(_to_float, vals), dtype="float64", count=len(bloco))
+                    chunk[c] = arr
+                    # Comentario: Solo los NaN (casi siempre celdas vacías) se revisan contra el valor crudo
+                    if invalido is None:
+                        invalido = np.zeros(len(bloco), dtype=bool)
+                    for i in np.flatnonzero(np.isnan(arr)):
+                        if not _is_blank(bloco[i][j]):
+                            invalido[i] = True
+                elif c in categorias:
+                    cat = categorias[c]
+                    codes = array("i")
+                    for v in vals:
+                        if v is None or (isinstance(v, str) and v == ""):
+                            codes.append(-1)
+                            continue
+                        k = v if isinstance(v, str) else str(v)
+                        code = cat.get(k)
+                        if code is None:
+                            code = cat[k] = len(cat)
+                        codes.append(code)
+                    chunk[c] = np.frombuffer(codes, dtype="int32")
+                else:
+                    chunk[c] = list(vals)
+            if invalido is not None:
+                chunk[NON_NUMERIC_COLUMN] = invalido
+            yield chunk
+    finally:
+        wb.close()
+
+
+def read_sheet(
+    file_bytes: bytes,
+    sheet_name: str,
+    columns: Iterable[str] = DATA_COLUMNS,
+    skip_rows: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> pd.DataFrame:
+    # Comentario: Arma el DataFrame bloque a bloque con dtypes compactos
+    meta: dict = {}
+    partes: dict[str, list] = {}
+    for chunk in iter_chunks(file_bytes, sheet_name, columns, skip_rows, chunk_rows, meta):
+        for c, v in chunk.items():
+            partes.setdefault(c, []).append(v)
+
+    categorias = meta["categorias"]
+    out = {}
+    colunas = meta["colunas"] + ([NON_NUMERIC_COLUMN] if NON_NUMERIC_COLUMN in partes else [])
+    for c in colunas:
+        vals = partes.get(c, [])
+        if c in NUMERIC_COLUMNS:
+            out[c] = np.concatenate(vals) if vals else np.empty(0, dtype="float64")
+        elif c == NON_NUMERIC_COLUMN:
+            out[c] = np.concatenate(vals)
+        elif c in categorias:
+            codes = np.concatenate(vals) if vals else np.empty(0, dtype="int32")
+            out[c] = pd.Categorical.from_codes(codes, categories=list(categorias[c]))
+        else:
+            s = pd.Series([v for p in vals for v in p], dtype=object)
+            out[c] = pd.to_datetime(s, errors="coerce") if c in TIMESTAMP_COLUMNS else s
+    return pd.DataFrame(out)
@@ -0,0 +1,147 @@
+# Cobertura de la rodovia: tramos KM INICIAL → KM FINAL como intervalos
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from components.filters import FilteredView
+from components.metrics import FRONTS
+
+EPS_KM = 1e-6  # Comentario: tramos que se tocan (fin == inicio, salvo redondeo) no dejan lacuna
+
+
+def km_columns(fronts=FRONTS) -> list[str]:
+    # Comentario: KM INICIAL / KM FINAL de cada frente (el ancho sale de m² / largo)
+    return [c for f in fronts for c in f.campos[:2]]
+
+
+class Cobertura(NamedTuple):
+    km_total: float         # Comentario: suma de los largos (cada pasada cuenta)
+    km_unicos: float        # Comentario: largo de la unión de los tramos
+    km_sobreposto: float    # Comentario: km_total − km_unicos
+    m2_sobreposto: float    # Comentario: m² de las partes ya cubiertas por otro tramo
+    km_lacunas: float       # Comentario: huecos entre el menor inicio y el mayor fin
+    lacunas: pd.DataFrame   # Comentario: (de, ate, km), de mayor a menor
+
+
+def sweep(grupo: np.ndarray, lo: np.ndarray, hi: np.ndarray, m2: np.ndarray) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Comentario: Barrido sobre tramos ordenados por (grupo, inicio) con el mayor fin visto
+    hasta ahora (por grupo). La parte de un tramo por debajo de ese fin ya estaba cubierta
+    (todos los anteriores empiezan antes), lo que queda por encima es km nuevo, y un inicio
+    por encima del fin es una lacuna. O(n) después del orden.
+    Devuelve (resumen por grupo, lacunas con su grupo).
+    """
+    n = len(lo)
+    if n == 0:
+        resumo = pd.DataFrame(columns=["grupo", "km_total", "km_unicos", "km_sobreposto", "m2_sobreposto", "km_lacunas"])
+        return resumo, pd.DataFrame({"grupo": grupo[:0], "de": lo[:0], "ate": lo[:0], "km": lo[:0]})
+
+    # Comentario: Desplazamiento por grupo → un solo maximum.accumulate para todos los grupos
+    base = float(lo.min())
+    desloc = grupo.astype("float64") * (float(hi.max()) - base + 1.0) - base
+    s = lo + desloc
+    e = hi + desloc
+    primeiro = np.empty(n, dtype=bool)
+    primeiro[0] = True
+    np.not_equal(grupo[1:], grupo[:-1], out=primeiro[1:])
+    prev = np.empty(n)
+    prev[0] = -np.inf
+    np.maximum.accumulate(e[:-1], out=prev[1:])
+    prev[primeiro] = -np.inf
+
+    comp = e - s
+    redund = np.clip(np.minimum(e, prev) - s, 0.0, comp)
+    gap = ~primeiro & (s > prev + EPS_KM)
+
+    inicios = np.flatnonzero(primeiro)
+    fim_grupo = np.maximum.reduceat(e, inicios)
+    km_total = np.add.reduceat(comp, inicios)
+    km_sobre = np.add.reduceat(redund, inicios)
+    resumo = pd.DataFrame({
+        "grupo": grupo[inicios],
+        "km_total": km_total,
+        "km_unicos": km_total - km_sobre,
+        "km_sobreposto": km_sobre,
+        "m2_sobreposto": np.add.reduceat(m2 * (redund / comp), inicios),
+        "km_lacunas": np.maximum((fim_grupo - s[inicios]) - (km_total - km_sobre), 0.0),
+    })
+    lacunas = pd.DataFrame({"grupo": grupo[gap], "de": prev[gap] - desloc[gap], "ate": lo[gap]})
+    lacunas["km"] = lacunas["ate"] - lacunas["de"]
+    return resumo, lacunas
+
+
+class SegmentIndex:
+    """
+    Comentario: Un tramo por (fila, frente) con KM válidos, ordenado una vez por inicio.
+    Filtrar = máscara sobre los tramos (el orden se mantiene, no se reordena por consulta).
+    `fila` es la posición en la base ordenada del FilterIndex (la misma que usa FilteredView).
+    KM invertido cuenta igual que en m² (|Δkm|); KM no numérico o tramo de largo 0 no entra.
+    """
+
+    def __init__(self, df: pd.DataFrame, fronts=FRONTS):
+        self.n_linhas = len(df)
+        partes = []
+        for f in fronts:
+            ki, kf = f.campos[:2]
+            if ki not in df.columns or kf not in df.columns or f.coluna not in df.columns:
+                continue
+            a = df[ki].to_numpy(dtype="float64", na_value=np.nan)
+            b = df[kf].to_numpy(dtype="float64", na_value=np.nan)
+            ok = np.isfinite(a) & np.isfinite(b) & (a != b)
+            fila = np.flatnonzero(ok)
+            partes.append((fila, np.minimum(a[ok], b[ok]), np.maximum(a[ok], b[ok]),
+                           df[f.coluna].to_numpy(dtype="float64")[ok]))
+
+        if partes:
+            fila, lo, hi, m2 = (np.concatenate(x) for x in zip(*partes))
+        else:
+            fila, lo, hi, m2 = np.empty(0, dtype="int64"), np.empty(0), np.empty(0), np.empty(0)
+        order = np.argsort(lo, kind="stable")
+        self.fila = fila[order]
+        self.lo = lo[order]
+        self.hi = hi[order]
+        self.m2 = m2[order]
+
+        if "EQUIPE" in df.columns:
+            cat = pd.Categorical(df["EQUIPE"])
+            self.equipes = cat.categories
+            self.equipe = cat.codes.astype("int32")[self.fila]
+        else:
+            self.equipes = pd.Index([])
+            self.equipe = np.full(len(self.fila), -1, dtype="int32")
+
+    def __len__(self) -> int:
+        return len(self.fila)
+
+    def _mask(self, view: FilteredView) -> np.ndarray:
+        if isinstance(view.rows, slice):
+            return (self.fila >= view.rows.start) & (self.fila < view.rows.stop)
+        linhas = np.zeros(self.n_linhas, dtype=bool)
+        linhas[view.rows] = True
+        return linhas[self.fila]
+
+    def coverage(self, view: FilteredView, top_lacunas: int = 5) -> Cobertura:
+        # Comentario: Toda la selección como una sola rodovia (pasadas de equipes distintas se sobreponen)
+        m = self._mask(view)
+        lo = self.lo[m]
+        resumo, lacunas = sweep(np.zeros(len(lo), dtype="int32"), lo, self.hi[m], self.m2[m])
+        lacunas = lacunas.drop(columns="grupo").nlargest(top_lacunas, "km").reset_index(drop=True)
+        if resumo.empty:
+            return Cobertura(0.0, 0.0, 0.0, 0.0, 0.0, lacunas)
+        r = resumo.iloc[0]
+        return Cobertura(float(r["km_total"]), float(r["km_unicos"]), float(r["km_sobreposto"]),
+                         float(r["m2_sobreposto"]), float(r["km_lacunas"]), lacunas)
+
+    def by_team(self, view: FilteredView) -> pd.DataFrame:
+        # Comentario: Misma cuenta por equipe (sobreposición = la equipe repasando sus propios tramos)
+        m = self._mask(view)
+        equipe = self.equipe[m]
+        # Comentario: Orden estable por equipe → dentro de cada una sigue ordenado por inicio
+        order = np.argsort(equipe, kind="stable")
+        resumo, lacunas = sweep(equipe[order], self.lo[m][order], self.hi[m][order], self.m2[m][order])
+        n_lac = lacunas.groupby("grupo").size()
+        resumo["lacunas"] = resumo["grupo"].map(n_lac).fillna(0).astype("int64")
+        nomes = np.asarray(self.equipes, dtype=object)
+        resumo.insert(0, "EQUIPE", [nomes[g] if g >= 0 else None for g in resumo["grupo"]])
+        return resumo.drop(columns="grupo").sort_values("km_unicos", ascending=False).reset_index(drop=True)
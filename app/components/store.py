@@ -0,0 +1,120 @@
+# Registro de bases compartido entre sesiones (un proceso de Streamlit)
+import threading
+import time
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+from components.compact import memory_bytes
+from components.filters import FilterIndex
+from components.metrics import TOTAL_COLUMN, build_cube, group_columns
+from components.outliers import OutlierSketch
+from components.partitions import TeamPartition, build_partitions
+from components.queries import DEFAULT_BACKEND, DuckDBQueries, PandasQueries, make_queries
+from components.quality import flag_counts
+from components.segments import SegmentIndex
+
+DEFAULT_SESSION_TTL = 2 * 3600  # Comentario: segundos sin rerun para dar una sesión por cerrada
+
+
+class Dataset(NamedTuple):
+    """
+    Comentario: Todo lo que se arma una vez por base (inmutable). Con copy-on-write de
+    pandas (por defecto desde pandas 3, fijado en requirements.txt) ninguna sesión puede
+    modificar los frames compartidos: cualquier escritura copia.
+    """
+    chave: str
+    df: pd.DataFrame            # Comentario: base ordenada por DATA (la del índice)
+    df_idx: FilterIndex
+    cube_idx: FilterIndex
+    outlier_sketch: OutlierSketch
+    segments: SegmentIndex      # Comentario: tramos KM ordenados (cobertura / sobreposición)
+    consultas: PandasQueries | DuckDBQueries  # Comentario: KPIs / gráficos del filtro (backend configurable)
+    equipes: dict[str, TeamPartition]         # Comentario: particiones de la página de detalle por equipe
+    cache_hit: bool             # Comentario: la sesión que la armó leyó el Parquet en disco
+    bytes: int
+
+
+def build_dataset(chave: str, df_loaded: pd.DataFrame, cache_hit: bool = False,
+                  backend: str = DEFAULT_BACKEND) -> Dataset:
+    df_idx = FilterIndex(df_loaded)
+    cube_idx = FilterIndex(build_cube(df_idx.df, contagens=flag_counts(df_idx.df)))
+    sketch = OutlierSketch(df_idx.df, cube_idx, (TOTAL_COLUMN, *group_columns().values()))
+    return Dataset(chave, df_idx.df, df_idx, cube_idx, sketch, SegmentIndex(df_idx.df),
+                   make_queries(backend, df_idx.df), build_partitions(df_idx, cube_idx), cache_hit,
+                   memory_bytes(df_idx.df) + memory_bytes(cube_idx.df))
+
+
+class DatasetStore:
+    """
+    Comentario: {hash del contenido: Dataset} + qué sesiones usan cada base.
+    La sesión guarda solo la clave (y su estado de filtros). Una base sin sesiones se
+    libera; una sesión sin reruns durante `session_ttl` deja de contar (Streamlit no
+    avisa cuando se cierra una pestaña).
+    """
+
+    def __init__(self, session_ttl: float = DEFAULT_SESSION_TTL):
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        self._datasets: dict[str, Dataset] = {}
+        self._sessoes: dict[str, dict[str, float]] = {}   # Comentario: chave → {sesión: último uso}
+        self._building: dict[str, threading.Lock] = {}
+
+    def acquire(self, chave: str, sessao: str, build: Callable[[], Dataset]) -> tuple[Dataset, bool]:
+        # Comentario: Devuelve (dataset, compartida). Dos sesiones con la misma base no la arman dos veces.
+        with self._lock:
+            lock = self._building.setdefault(chave, threading.Lock())
+        with lock:
+            try:
+                with self._lock:
+                    ds = self._datasets.get(chave)
+                compartida = ds is not None
+                if ds is None:
+                    ds = build()
+                with self._lock:
+                    ds = self._datasets.setdefault(chave, ds)
+                    self._sessoes.setdefault(chave, {})[sessao] = time.monotonic()
+            finally:
+                with self._lock:
+                    self._building.pop(chave, None)
+        self.sweep()
+        return ds, compartida
+
+    def get(self, chave: str, sessao: str) -> Dataset | None:
+        # Comentario: Usado en cada rerun: renueva el TTL de la sesión y libera las bases
+        # de sesiones vencidas (sin esto, una base abandonada esperaba al próximo upload)
+        with self._lock:
+            ds = self._datasets.get(chave)
+            if ds is not None:
+                self._sessoes.setdefault(chave, {})[sessao] = time.monotonic()
+        self.sweep()
+        return ds
+
+    def has(self, chave: str) -> bool:
+        with self._lock:
+            return chave in self._datasets
+
+    def release(self, chave: str, sessao: str) -> None:
+        with self._lock:
+            self._sessoes.get(chave, {}).pop(sessao, None)
+        self.sweep()
+
+    def sweep(self) -> None:
+        # Comentario: Saca sesiones vencidas y libera las bases sin referencias
+        limite = time.monotonic() - self.session_ttl
+        with self._lock:
+            for chave in list(self._datasets):
+                sessoes = self._sessoes.get(chave, {})
+                for s in [s for s, t in sessoes.items() if t < limite]:
+                    del sessoes[s]
+                if not sessoes:
+                    self._datasets.pop(chave, None)
+                    self._sessoes.pop(chave, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "bases": len(self._datasets),
+                "sessoes": len({s for v in self._sessoes.values() for s in v}),
+                "bytes": sum(ds.bytes for ds in self._datasets.values()),
+            }
@@ -0,0 +1,64 @@
+# Fuente de datos: carpeta monitoreada (export diario del formulário)
+import hashlib
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+
+class WatchedFile(NamedTuple):
+    path: Path
+    mtime_ns: int
+    size: int
+    sha: str
+
+
+def file_sha(path: Path, bloco: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            b = f.read(bloco)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+
+class DirectoryWatcher:
+    """
+    Comentario: Sigue el .xlsx más reciente de la carpeta. Cada poll() es un stat();
+    el archivo solo se vuelve a hashear si cambió mtime o tamaño, y la versión cambia
+    solo si cambió el contenido (un "touch" no dispara reingesta).
+    `jobs` = {sha: id del job que lo está ingiriendo}, compartido entre sesiones.
+    """
+
+    def __init__(self, diretorio: str | Path, padrao: str = "*.xlsx"):
+        self.diretorio = Path(diretorio)
+        self.padrao = padrao
+        self._lock = threading.Lock()
+        self._vistos: dict[Path, WatchedFile] = {}
+        self.jobs: dict[str, str] = {}
+
+    def _latest(self) -> Path | None:
+        # Comentario: "~$arquivo.xlsx" = lock del Excel abierto, no es un export
+        candidatos = [p for p in self.diretorio.glob(self.padrao) if p.is_file() and not p.name.startswith("~$")]
+        if not candidatos:
+            return None
+        return max(candidatos, key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+    def poll(self) -> WatchedFile | None:
+        with self._lock:
+            path = None
+            try:
+                path = self._latest()
+                if path is None:
+                    return None
+                st = path.stat()
+                visto = self._vistos.get(path)
+                if visto is not None and (visto.mtime_ns, visto.size) == (st.st_mtime_ns, st.st_size):
+                    return visto
+                visto = WatchedFile(path, st.st_mtime_ns, st.st_size, file_sha(path))
+            except OSError:
+                # Comentario: Archivo siendo copiado / borrado entre glob y lectura: se reintenta en el próximo poll
+                return self._vistos.get(path) if path is not None else None
+            self._vistos[path] = visto
+            return visto
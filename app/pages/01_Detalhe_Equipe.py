@@ -1 +1,137 @@
-# Página de detalhe por equipe
+# Página de detalle por equipe
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from components.charts import choose_granularity, fronts_chart, team_daily_chart
+from components.detail import PAGE_SIZE
+from components.memo import Memo
+from components.metas import MetasIndex, team_goal_summary
+from components.metrics import FRONTS
+from components.partitions import JANELAS, rolling_columns, team_goals, window
+from shared import fmt_dec_br, fmt_int_br, get_store, inject_css, kpi_card, session_id
+
+st.set_page_config(page_title="Detalhe por equipe — SLN RDT", layout="wide")
+inject_css()
+
+# =========================
+# Base da sessão
+# =========================
+# Comentario: La base es la que cargó el tablero (mismo DatasetStore, misma sesión);
+# esta página no lee Excel ni arma índices
+store = get_store()
+sessao = session_id()
+ds = store.get(st.session_state["dataset_key"], sessao) if "dataset_key" in st.session_state else None
+if ds is None or not ds.equipes:
+    st.info("Nenhuma base carregada nesta sessão (ou a base não tem a coluna EQUIPE). Carregue os dados no painel principal.")
+    st.page_link("app.py", label="Ir para o painel", icon="📊")
+    st.stop()
+
+df_metas = st.session_state.get("df_metas", None)
+metas_idx = st.session_state.get("metas_idx") or MetasIndex(df_metas)
+memo = st.session_state.setdefault("memo", Memo())
+
+# =========================
+# Header + seleção
+# =========================
+st.markdown("""
+<div class="topbar">
+  <div class="brand">
+    <h2 style="margin:0;">Detalhe por equipe</h2>
+    <span class="pill">MVP</span>
+  </div>
+  <span class="clock">série diária, médias móveis, frentes e metas</span>
+</div>
+""", unsafe_allow_html=True)
+st.write("")
+
+equipes = sorted(ds.equipes)
+c1, c2 = st.columns([1, 1])
+with c1:
+    # Comentario: La equipe elegida se recuerda entre páginas (key en la sesión)
+    equipe = st.selectbox("Equipe", equipes, key="detalhe_equipe")
+part = ds.equipes[equipe]
+serie_total = part.serie
+dmin, dmax = serie_total["DATA"].iloc[0].date(), serie_total["DATA"].iloc[-1].date()
+with c2:
+    periodo = st.date_input("Período", value=(dmin, dmax), min_value=dmin, max_value=dmax,
+                            key=f"detalhe_periodo_{equipe}")
+d1, d2 = (periodo if isinstance(periodo, tuple) and len(periodo) == 2 else (dmin, dmax))
+
+# Comentario: Recorte por búsqueda binaria sobre la serie ya armada (no se filtra la base)
+serie = window(serie_total, d1, d2)
+if serie.empty:
+    st.warning("Nenhum dia no período selecionado.")
+    st.stop()
+
+# =========================
+# KPIs
+# =========================
+m2_total = float(serie["m2_total"].sum())
+dias_com = int((serie["registros"] > 0).sum())
+ultimo = serie.iloc[-1]
+medias = dict(zip(rolling_columns(), (f"Média {n}d" for n in JANELAS)))
+
+k1, k2, k3, k4 = st.columns(4)
+with k1:
+    st.markdown(kpi_card("m² total (período)", fmt_int_br(m2_total), "m²"), unsafe_allow_html=True)
+with k2:
+    st.markdown(kpi_card("Dias com produção", f"{dias_com}/{len(serie)}", "📅",
+                         f"{int(serie['registros'].sum())} registros", "blue"), unsafe_allow_html=True)
+for col, (coluna, rotulo) in zip((k3, k4), medias.items()):
+    with col:
+        st.markdown(kpi_card(f"{rotulo} (m²/dia)", fmt_int_br(ultimo[coluna]), "↗",
+                             ultimo["DATA"].strftime("%d/%m/%Y"), "green"), unsafe_allow_html=True)
+st.write("")
+
+# =========================
+# Metas da equipe (opcional)
+# =========================
+meta_media = None
+if metas_idx:
+    # Comentario: Pares (dia, meta) de la equipe: solo sus celdas del cubo, memoizado por equipe + metas
+    pares = memo.get("equipe_metas", (ds.chave, equipe, metas_idx), lambda: team_goals(part, ds.cube_idx.df, df_metas))
+    dia = pd.to_datetime(pares["DATA"])
+    pares = pares[(dia >= pd.Timestamp(d1)) & (dia < pd.Timestamp(d2) + pd.Timedelta(days=1))]
+    resumo = team_goal_summary(pares)
+    if not resumo.empty:
+        r = resumo.iloc[0]
+        meta_media = float(pares["meta"].mean())
+        st.markdown(
+            f'<span class="badge blue">Metas</span> Dias com meta: **{int(r["Dias com meta"])}** · '
+            f'atingidos: **{int(r["Dias atingidos"])}** · atingimento médio: **{fmt_dec_br(r["Atingimento médio (%)"])}%**',
+            unsafe_allow_html=True)
+    else:
+        st.caption("Nenhuma meta vigente para esta equipe no período.")
+
+# =========================
+# Gráficos
+# =========================
+left, right = st.columns([1.6, 1])
+with left:
+    st.markdown('<div class="card"><div class="section-title">Produção diária</div><div class="section-sub">m²/dia com médias móveis (dias sem registro = 0)</div>', unsafe_allow_html=True)
+    st.altair_chart(team_daily_chart(serie, medias, meta_media), use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+with right:
+    freq, rotulo = choose_granularity(d1, d2)
+    frentes = {f.coluna: f.sufixo for f in FRONTS if f.coluna in serie.columns}
+    st.markdown(f'<div class="card"><div class="section-title">Frentes</div><div class="section-sub">m² por frente (por {rotulo})</div>', unsafe_allow_html=True)
+    st.altair_chart(fronts_chart(serie, frentes, freq, rotulo), use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+st.write("")
+
+# =========================
+# Registros recentes
+# =========================
+# Comentario: Las posiciones de la equipe están ordenadas por DATA → los últimos PAGE_SIZE
+# del período salen de un searchsorted, sin recorrer la base
+st.markdown('<div class="card"><div class="section-title">Registros recentes</div><div class="section-sub">últimos registros da equipe no período</div>', unsafe_allow_html=True)
+base = ds.df_idx.df
+datas = base["DATA"].to_numpy()[part.posicoes]
+fim = datas.searchsorted(np.datetime64(pd.Timestamp(d2) + pd.Timedelta(days=1)), side="left")
+ini = max(datas.searchsorted(np.datetime64(pd.Timestamp(d1)), side="left"), fim - PAGE_SIZE)
+cols = [c for c in ["DATA", "SUPERVISOR", "NOME DO ENCARREGADO", "m2_total", "m2_manual", "m2_tratores", "m2_robo"] if c in base.columns]
+df_show = base.iloc[part.posicoes[ini:fim][::-1]][cols]
+st.dataframe(df_show, use_container_width=True, hide_index=True,
+             column_config={"DATA": st.column_config.DateColumn("DATA", format="DD/MM/YYYY")})
+st.markdown("</div>", unsafe_allow_html=True)
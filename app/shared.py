@@ -0,0 +1,213 @@
+# Compartido entre las páginas (dashboard y detalle por equipe): estilo, helpers y registro de bases
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from components.store import DEFAULT_SESSION_TTL, DatasetStore
+
+# =========================
+# CSS (estilo “dashboard product”)
+# =========================
+CSS = """
+<style>
+:root{
+  --bg:#f4f6fb;
+  --card:#ffffff;
+  --muted:#6b7280;
+  --text:#0f172a;
+  --border:#e8edf5;
+  --shadow: 0 8px 22px rgba(15, 23, 42, 0.06);
+  --radius:16px;
+  --blue:#2563eb;
+  --green:#10b981;
+  --red:#ef4444;
+}
+
+.stApp{ background: var(--bg); }
+.block-container{ padding-top: 1.0rem; padding-bottom: 2rem; max-width: 1400px; }
+
+section[data-testid="stSidebar"]{
+  background:#ffffff;
+  border-right:1px solid var(--border);
+}
+
+header[data-testid="stHeader"]{ background: transparent; }
+
+.card{
+  background: var(--card);
+  border: 1px solid var(--border);
+  border-radius: var(--radius);
+  box-shadow: var(--shadow);
+  padding: 14px 14px;
+}
+
+.section-title{
+  font-weight: 900;
+  color: var(--text);
+  letter-spacing: .2px;
+  font-size: 16px;
+  margin: 0 0 8px 0;
+}
+.section-sub{
+  color: var(--muted);
+  font-size: 12px;
+  margin: -4px 0 10px 0;
+}
+
+.topbar{
+  display:flex;
+  align-items:center;
+  justify-content:space-between;
+  gap:12px;
+  margin-bottom: 12px;
+}
+.brand{
+  display:flex;
+  align-items:center;
+  gap:10px;
+}
+.brand .pill{
+  background:#e9efff;
+  color:#1d4ed8;
+  border:1px solid #dbe7ff;
+  padding: 2px 10px;
+  border-radius: 999px;
+  font-size: 12px;
+  font-weight: 800;
+}
+.clock{ color: var(--muted); font-size: 12px; }
+.live{
+  display:inline-flex;
+  align-items:center;
+  gap:6px;
+  color:#059669;
+  font-size: 12px;
+  font-weight: 800;
+}
+.dot{ width:8px; height:8px; border-radius:999px; background:#10b981; display:inline-block; }
+
+.alert{
+  background: #fee2e2;
+  border: 1px solid #fecaca;
+  color: #991b1b;
+  border-radius: var(--radius);
+  box-shadow: var(--shadow);
+  padding: 14px;
+  display:flex;
+  align-items:center;
+  justify-content:space-between;
+  margin-bottom: 12px;
+}
+.alert strong{ font-weight: 900; }
+.alert small{ color:#7f1d1d; display:block; margin-top:4px; }
+
+.kpi{
+  background: var(--card);
+  border: 1px solid var(--border);
+  border-radius: var(--radius);
+  box-shadow: var(--shadow);
+  padding: 12px 12px;
+  display:flex;
+  align-items:center;
+  justify-content:space-between;
+  gap:10px;
+  min-height: 78px;
+}
+.kpi .left{ display:flex; gap:10px; align-items:center; }
+.icon{
+  width:34px; height:34px;
+  border-radius: 12px;
+  display:flex;
+  align-items:center;
+  justify-content:center;
+  font-weight:900;
+  color: var(--text);
+  background:#f1f5ff;
+  border:1px solid var(--border);
+}
+.kpi .label{ color: var(--muted); font-size: 12px; margin-bottom: 2px; }
+.kpi .value{ color: var(--text); font-size: 20px; font-weight: 950; letter-spacing: .2px; }
+
+.badge{
+  border-radius: 999px;
+  padding: 2px 10px;
+  font-size: 11px;
+  font-weight: 900;
+  border: 1px solid var(--border);
+  background:#f8fafc;
+  color: var(--muted);
+  white-space: nowrap;
+}
+.badge.red{ background:#fee2e2; border-color:#fecaca; color:#991b1b; }
+.badge.green{ background:#dcfce7; border-color:#bbf7d0; color:#166534; }
+.badge.blue{ background:#dbeafe; border-color:#bfdbfe; color:#1e40af; }
+</style>
+"""
+
+
+def inject_css() -> None:
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+# =========================
+# Helpers
+# =========================
+
+def fmt_int_br(x: float) -> str:
+    # Comentario: Formato BR (1.234.567)
+    try:
+        return f"{float(x):,.0f}".replace(",", ".")
+    except Exception:
+        return "0"
+
+
+def fmt_dec_br(x: float, casas: int = 1) -> str:
+    # Comentario: Formato BR con decimales (1.234,5)
+    return f"{float(x):,.{casas}f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def safe_unique(df: pd.DataFrame, col: str) -> list:
+    # Comentario: Valores únicos sin NaN/vacío
+    if col not in df.columns:
+        return []
+    vals = df[col].dropna().astype(str).tolist()
+    vals = [v.strip() for v in vals if v.strip() != ""]
+    return sorted(list(set(vals)))
+
+
+def kpi_card(label: str, value: str, icon_text: str = "•", badge_text: str | None = None, badge_kind: str = "blue") -> str:
+    # Comentario: KPI en HTML para estética tipo producto
+    badge_html = ""
+    if badge_text is not None:
+        badge_html = f'<span class="badge {badge_kind}">{badge_text}</span>'
+    return f"""
+    <div class="kpi">
+      <div class="left">
+        <div class="icon">{icon_text}</div>
+        <div>
+          <div class="label">{label}</div>
+          <div class="value">{value}</div>
+        </div>
+      </div>
+      <div>{badge_html}</div>
+    </div>
+    """
+
+
+
+# =========================
+# Registro de bases (proceso)
+# =========================
+# Comentario: Sesiones con el mismo Excel comparten una sola copia; las páginas también
+SESSION_TTL = int(st.secrets.get("SESSION_TTL_MIN", DEFAULT_SESSION_TTL // 60)) * 60
+
+
+@st.cache_resource
+def get_store() -> DatasetStore:
+    return DatasetStore(SESSION_TTL)
+
+
+def session_id() -> str:
+    # Comentario: Id de la sesión del navegador (el mismo en todas las páginas)
+    return st.session_state.setdefault("sessao_id", uuid.uuid4().hex)
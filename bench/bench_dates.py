@@ -0,0 +1,108 @@
+"""
+Microbenchmark da normalização de DATA: implementação anterior (to_datetime sem formato
++ segunda passada serial + .dt.date) vs components.dates.normalize_date_column.
+
+Células mistas como no formulário: datetime do Excel, serial numérico, dd/mm/aaaa,
+ISO e um pouco de texto inválido.
+
+Antes de medir, confere casos de regressão (ex.: formato que só aparece depois da amostra
+usada para ordenar os formatos).
+
+Uso:
+    python bench/bench_dates.py [--rows 1000000] [--repeat 3]
+"""
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from components.dates import AMOSTRA, EXCEL_EPOCH_SERIAL, normalize_date_column, parse_dates  # noqa: E402
+
+
+def normalize_legacy(df: pd.DataFrame, col: str = "DATA") -> pd.DataFrame:
+    warnings.simplefilter("ignore", UserWarning)  # Comentario: aviso de dayfirst en cada chamada
+    s = df[col]
+    dt_ = pd.to_datetime(s, errors="coerce")
+    if dt_.isna().any():
+        num = pd.to_numeric(s, errors="coerce")
+        dt2 = pd.to_datetime(num, unit="D", origin="1899-12-30", errors="coerce")
+        dt_ = dt_.fillna(dt2)
+    df = df.copy()
+    df[col] = dt_
+    df = df[df[col].notna()].copy()
+    df[col] = df[col].dt.date
+    return df
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    # Comentario: ~3 anos de datas; 50% datetime, 20% serial, 15% dd/mm/aaaa, 14% ISO, 1% lixo
+    rng = np.random.default_rng(seed)
+    base = dt.date(2023, 1, 1)
+    dias = rng.integers(0, 3 * 365, rows)
+    tipo = rng.choice(5, rows, p=[0.50, 0.20, 0.15, 0.14, 0.01])
+    vals = []
+    for d, t in zip(dias.tolist(), tipo.tolist()):
+        data = base + dt.timedelta(days=d)
+        if t == 0:
+            vals.append(dt.datetime(data.year, data.month, data.day))
+        elif t == 1:
+            vals.append(data.toordinal() - dt.date(1970, 1, 1).toordinal() + EXCEL_EPOCH_SERIAL)
+        elif t == 2:
+            vals.append(data.strftime("%d/%m/%Y"))
+        elif t == 3:
+            vals.append(data.isoformat())
+        else:
+            vals.append("ontem")
+    return pd.DataFrame({"DATA": pd.Series(vals, dtype=object)})
+
+
+def check_regressions() -> None:
+    # Comentario: Formato novo depois da amostra (export que muda de formato no meio do ano):
+    # as datas ISO do fim também precisam ser lidas
+    base = dt.date(2023, 1, 1)
+    vals = [(base + dt.timedelta(days=i)).strftime("%d/%m/%Y") for i in range(AMOSTRA + 44)]
+    vals += [(base + dt.timedelta(days=400 + i)).isoformat() for i in range(10)]
+    dias, invalidas = parse_dates(pd.Series(vals, dtype=object))
+    esperado = np.array([base + dt.timedelta(days=400 + i) for i in range(10)], dtype="datetime64[D]")
+    assert invalidas == 0 and (dias[-10:] == esperado).all(), f"formato tardio descartado: {invalidas} inválidas"
+
+    # Comentario: Vazias (None, "", só espaços) não contam como DATA inválida
+    df = pd.DataFrame({"DATA": pd.Series(["01/02/2024", None, "", "   ", "ontem"], dtype=object)})
+    out, invalidas, vazias = normalize_date_column(df)
+    assert (len(out), invalidas, vazias) == (1, 1, 3), f"vazias/inválidas: {len(out)}, {invalidas}, {vazias}"
+
+
+def timeit(fn, df: pd.DataFrame, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    check_regressions()
+    print(f"{'rows':>10}{'legacy ms':>12}{'new ms':>10}{'speedup':>9}{'invalid':>9}")
+    for n in args.rows:
+        df = make_frame(n)
+        _, invalidas, _ = normalize_date_column(df)
+        t_old = timeit(normalize_legacy, df, args.repeat)
+        t_new = timeit(normalize_date_column, df, args.repeat)
+        print(f"{n:>10}{t_old * 1e3:>12.1f}{t_new * 1e3:>10.1f}{t_old / t_new:>8.1f}x{invalidas:>9}")
+
+
+if __name__ == "__main__":
+    main()
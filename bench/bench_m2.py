@@ -0,0 +1,80 @@
+"""
+Microbenchmark do motor de m²: implementação anterior (5× calc_m2 + 2× sum(axis=1))
+vs components.metrics.enrich_m2.
+
+Uso:
+    python bench/bench_m2.py [--rows 100000 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from components.metrics import FRONTS, enrich_m2  # noqa: E402
+
+
+def calc_m2_legacy(df: pd.DataFrame, km_ini: str, km_fim: str, largura: str) -> pd.Series:
+    ini = pd.to_numeric(df.get(km_ini), errors="coerce")
+    fim = pd.to_numeric(df.get(km_fim), errors="coerce")
+    lar = pd.to_numeric(df.get(largura), errors="coerce")
+    m2 = (fim - ini).abs() * 1000 * lar
+    return m2.fillna(0)
+
+
+def enrich_m2_legacy(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for f in FRONTS:
+        df[f.coluna] = calc_m2_legacy(df, *f.campos)
+    df["m2_tratores"] = df[["m2_trator_a", "m2_trator_b", "m2_trator_c"]].sum(axis=1)
+    df["m2_total"] = df[["m2_manual", "m2_tratores", "m2_robo"]].sum(axis=1)
+    return df
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    # Comentario: ~50% das frentes vazias por linha (como no formulário real)
+    rng = np.random.default_rng(seed)
+    data = {}
+    for f in FRONTS:
+        ini = rng.uniform(0, 300, rows)
+        fim = ini + rng.uniform(-0.5, 4, rows)
+        lar = rng.choice([2.0, 3.0, 4.5], rows)
+        vazio = rng.random(rows) < 0.5
+        ini[vazio] = fim[vazio] = lar[vazio] = np.nan
+        for col, v in zip(f.campos, (ini, fim, lar)):
+            data[col] = v
+    return pd.DataFrame(data)
+
+
+def timeit(fn, df: pd.DataFrame, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'rows':>10}{'legacy ms':>12}{'engine ms':>12}{'speedup':>9}")
+    for n in args.rows:
+        df = make_frame(n)
+        a = enrich_m2_legacy(df)
+        b = enrich_m2(df)
+        assert np.allclose(a["m2_total"].to_numpy(), b["m2_total"].to_numpy())
+        t_old = timeit(enrich_m2_legacy, df, args.repeat)
+        t_new = timeit(enrich_m2, df, args.repeat)
+        print(f"{n:>10}{t_old * 1e3:>12.1f}{t_new * 1e3:>12.1f}{t_old / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
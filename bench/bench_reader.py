@@ -0,0 +1,111 @@
+"""
+Benchmark de memoria (pico de RSS) y tiempo: pd.read_excel vs lector en streaming.
+
+Uso:
+    python bench/bench_reader.py [arquivo.xlsx] [--rows N] [--sheet NOME]
+
+Sin archivo se genera un libro sintético con N filas (y columnas extra del
+formulario que el lector en streaming no necesita leer). Cada cargador corre en
+un proceso nuevo para que el pico de RSS de uno no contamine al otro.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHEET = "Respostas ao formulário 1"
+
+_CHILD = r"""
+import io, json, resource, sys, time
+sys.path.insert(0, {app!r})
+import pandas as pd
+from components.reader import read_sheet
+
+def rss_mb():
+    # Comentario: ru_maxrss en KB (Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+data = open({path!r}, "rb").read()
+base = rss_mb()
+t0 = time.perf_counter()
+if {loader!r} == "read_excel":
+    df = pd.read_excel(io.BytesIO(data), sheet_name={sheet!r})
+else:
+    df = read_sheet(data, {sheet!r})
+dt = time.perf_counter() - t0
+print(json.dumps({{
+    "loader": {loader!r}, "rows": len(df), "cols": df.shape[1], "seconds": round(dt, 3),
+    "peak_rss_mb": round(rss_mb(), 1), "delta_rss_mb": round(rss_mb() - base, 1),
+    "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+}}))
+"""
+
+
+def make_workbook(path: str, rows: int, extra_cols: int = 40) -> None:
+    # Comentario: Libro sintético simple (write_only para no inflar la memoria del generador)
+    import datetime as dt
+    import random
+
+    import openpyxl
+
+    rnd = random.Random(42)
+    frentes = ["Roçada Manual", "Trator A", "Trator B", "Trator C", "Robô"]
+    header = ["Carimbo de data/hora", "DATA", "SUPERVISOR", "NOME DO ENCARREGADO", "EQUIPE"]
+    for f in frentes:
+        header += [f"KM INICIAL ({f})", f"KM FINAL ({f})", f"LARGURA (média) ({f})"]
+    header += [f"PERGUNTA {i}" for i in range(extra_cols)]
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET)
+    ws.append(header)
+    d0 = dt.datetime(2024, 1, 1)
+    for i in range(rows):
+        d = d0 + dt.timedelta(days=i % 365)
+        eq = rnd.randint(1, 60)
+        row = [d, d.date(), f"SUP {eq % 8}", f"ENC {eq}", f"EQ{eq:03d}"]
+        for _ in frentes:
+            ini = round(rnd.uniform(0, 300), 3)
+            row += [ini, round(ini + rnd.uniform(0, 4), 3), rnd.choice([2, 3, 4.5])]
+        row += ["texto livre de resposta do formulário"] * extra_cols
+        ws.append(row)
+    wb.save(path)
+
+
+def run(loader: str, path: str, sheet: str) -> dict:
+    code = _CHILD.format(app=os.path.join(ROOT, "app"), path=path, sheet=sheet, loader=loader)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("path", nargs="?")
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--sheet", default=SHEET)
+    args = ap.parse_args()
+
+    path = args.path
+    tmp = None
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+        tmp.close()
+        path = tmp.name
+        print(f"Gerando {args.rows} linhas em {path} ...", file=sys.stderr)
+        make_workbook(path, args.rows)
+
+    try:
+        print(f"{'loader':<12}{'rows':>10}{'cols':>6}{'s':>9}{'peak MB':>10}{'Δ MB':>9}{'frame MB':>10}")
+        for loader in ("read_excel", "streaming"):
+            r = run(loader, path, args.sheet)
+            print(f"{r['loader']:<12}{r['rows']:>10}{r['cols']:>6}{r['seconds']:>9}"
+                  f"{r['peak_rss_mb']:>10}{r['delta_rss_mb']:>9}{r['frame_mb']:>10}")
+    finally:
+        if tmp is not None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
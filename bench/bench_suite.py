@@ -0,0 +1,202 @@
+"""
+Suíte de benchmarks do pipeline (planilhas sintéticas de bench/synth.py).
+
+Etapas medidas por tamanho:
+    load_cold   engine.load_excel_data sem cache (lê o XLSX, valida, normaliza, m²)
+    load_warm   engine.load_excel_data com o Parquet já em disco
+    enrich_m2   motor de m² sobre as linhas cruas
+    filter      FilterIndex + 50 seleções (período + equipes)
+    aggregate   build_cube + KPIs, tendência, ranking e composição
+    coverage    SegmentIndex + 50 coberturas KM (mesmas seleções do filter)
+    queries_*   50 seleções × KPIs, tendência, ranking, composição e qualidade por backend
+                (pandas sobre o cubo; duckdb = SQL, a carga da tabela fica fora do tempo)
+    export_*    seleção inteira → CSV / Parquet (.zip) em chunks, num BytesIO (XLSX fica de fora:
+                o openpyxl escreve fila a fila e dominaria a suíte)
+    goals       MetasIndex + 200 resoluções + daily_team_goals
+
+Para cada etapa: tempo (melhor de --repeat; load_cold roda uma vez) e pico de memória
+alocada (tracemalloc, numa execução à parte para não distorcer o tempo; buffers do
+pyarrow não aparecem, por isso load_warm fica perto de zero).
+
+Uso:
+    python bench/bench_suite.py [--rows 10000 100000 1000000] [--repeat 3] [--backends pandas duckdb]
+                                [--baseline bench/baseline.json] [--save-baseline]
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+BENCH = Path(__file__).resolve().parent
+ROOT = BENCH.parent
+sys.path.insert(0, str(ROOT / "app"))
+sys.path.insert(0, str(BENCH))
+
+from components.engine import DEFAULT_SHEET, load_excel_data, load_excel_metas  # noqa: E402
+from components.export import export_columns, export_file  # noqa: E402
+from components.filters import FilterIndex  # noqa: E402
+from components.metas import MetasIndex, daily_team_goals  # noqa: E402
+from components.metrics import build_cube, composition, enrich_m2, kpis, ranking, trend  # noqa: E402
+from components.quality import flag_counts  # noqa: E402
+from components.queries import QUERY_BACKENDS, make_queries  # noqa: E402
+from components.reader import read_sheet  # noqa: E402
+from components.segments import SegmentIndex  # noqa: E402
+from synth import make_workbook  # noqa: E402
+
+DEFAULT_DATA_DIR = ROOT / ".cache" / "bench"
+DEFAULT_BASELINE = BENCH / "baseline.json"
+
+
+def measure(fn, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 4), "peak_mb": round(pico / 2**20, 1)}
+
+
+def workbook(data_dir: Path, rows: int) -> Path:
+    # Comentario: Gerado uma vez por tamanho (seed fixa) e reaproveitado entre execuções
+    path = data_dir / f"synth_{rows}.xlsx"
+    if not path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        t0 = time.perf_counter()
+        make_workbook(str(path), rows)
+        print(f"  gerado {path.name} em {time.perf_counter() - t0:.0f}s", file=sys.stderr)
+    return path
+
+
+def run_size(path: Path, repeat: int, backends: list[str]) -> dict:
+    file_bytes = path.read_bytes()
+    cache_dir = Path(tempfile.mkdtemp(prefix="bench_cache_"))
+    res = {}
+    try:
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return load_excel_data(file_bytes, DEFAULT_SHEET, str(path), cache_dir)
+
+        res["load_cold"] = measure(cold, 1)
+        df, _ = load_excel_data(file_bytes, DEFAULT_SHEET, str(path), cache_dir)
+        res["load_warm"] = measure(lambda: load_excel_data(file_bytes, DEFAULT_SHEET, str(path), cache_dir), repeat)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    raw = read_sheet(file_bytes, DEFAULT_SHEET)
+    res["enrich_m2"] = measure(lambda: enrich_m2(raw), repeat)
+    del raw
+
+    df_idx = FilterIndex(df)
+    dias = df_idx.df["DATA"]
+    equipes = list(df_idx.codigos.get("EQUIPE", {}))
+    rng = np.random.default_rng(0)
+    selecoes = []
+    for _ in range(50):
+        a, b = np.sort(rng.integers(0, len(dias), 2))
+        sel = list(rng.choice(equipes, min(3, len(equipes)), replace=False)) if rng.random() < 0.5 else []
+        selecoes.append((dias.iloc[a].date(), dias.iloc[b].date(), {"EQUIPE": sel}))
+
+    def filtrar():
+        idx = FilterIndex(df)
+        for d1, d2, sel in selecoes:
+            len(idx.select(d1, d2, sel))
+
+    res["filter"] = measure(filtrar, repeat)
+
+    def agregar():
+        cube = build_cube(df_idx.df, contagens=flag_counts(df_idx.df))
+        kpis(cube), trend(cube), ranking(cube), composition(cube)
+        return cube
+
+    res["aggregate"] = measure(agregar, repeat)
+    cube = agregar()
+
+    def cobertura():
+        seg = SegmentIndex(df_idx.df)
+        for d1, d2, sel in selecoes:
+            seg.coverage(df_idx.select(d1, d2, sel))
+
+    res["coverage"] = measure(cobertura, repeat)
+
+    cube_idx = FilterIndex(build_cube(df_idx.df, contagens=flag_counts(df_idx.df)))
+    for backend in backends:
+        consultas = make_queries(backend, df_idx.df)
+        if consultas.nome != backend:
+            print(f"  backend {backend} indisponível", file=sys.stderr)
+            continue
+
+        def consultar():
+            for d1, d2, sel in selecoes:
+                v = consultas.view(d1, d2, sel, cube_idx.select(d1, d2, sel))
+                v.kpis(), v.trend(), v.ranking(), v.composition(), v.quality_totals()
+
+        res[f"queries_{backend}"] = measure(consultar, repeat)
+
+    tudo = df_idx.select(dias.iloc[0].date(), dias.iloc[-1].date(), {})
+    for formato in ("csv", "parquet"):
+        res[f"export_{formato}"] = measure(
+            lambda: export_file(formato, tudo, export_columns(df_idx.df), {}, io.BytesIO()), repeat)
+
+    df_metas = load_excel_metas(file_bytes)
+    sups = sorted({str(s) for s in cube["SUPERVISOR"].dropna()})
+    contextos = [{"Equipe": e, "Supervisor": s} for e, s in zip(equipes * 5, sups * 50)][:200]
+
+    def metas():
+        idx = MetasIndex(df_metas)
+        for (d1, d2, _), ctx in zip(selecoes * 4, contextos):
+            idx.resolve(ctx, d1, d2)
+        daily_team_goals(cube, df_metas)
+
+    res["goals"] = measure(metas, repeat)
+    return res
+
+
+def report(resultados: dict, baseline: dict) -> None:
+    print(f"{'rows':>9} {'etapa':<16}{'s':>10}{'pico MB':>9}{'base s':>10}{'razão':>8}")
+    for rows, etapas in resultados.items():
+        for etapa, m in etapas.items():
+            b = baseline.get(rows, {}).get(etapa)
+            base_s = f"{b['seconds']:.4f}" if b else "—"
+            razao = f"{m['seconds'] / b['seconds']:.2f}x" if b and b["seconds"] else "—"
+            print(f"{rows:>9} {etapa:<16}{m['seconds']:>10.4f}{m['peak_mb']:>9.1f}{base_s:>10}{razao:>8}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--backends", nargs="+", choices=QUERY_BACKENDS, default=list(QUERY_BACKENDS))
+    ap.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova baseline")
+    args = ap.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+    resultados = {}
+    for n in args.rows:
+        print(f"{n} linhas…", file=sys.stderr)
+        resultados[str(n)] = run_size(workbook(args.data_dir, n), args.repeat, args.backends)
+    report(resultados, baseline)
+
+    if args.save_baseline:
+        baseline.update(resultados)
+        tmp = args.baseline.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, args.baseline)
+        print(f"baseline gravada em {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Gerador de planilhas sintéticas no formato do export do formulário.
+
+Gera um .xlsx com a aba "Respostas ao formulário 1" (KM/largura por frente, com
+uma fração configurável de valores sujos e datas em formatos misturados) e a aba
+"Metas" (Geral, por Supervisor e por Equipe, com vigências).
+
+Uso:
+    python bench/synth.py saida.xlsx [--rows 100000] [--teams 40] [--dirty 0.05]
+                          [--mixed-dates 0.3] [--days 365] [--seed 0]
+"""
+import argparse
+import datetime as dt
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from components.engine import DEFAULT_SHEET  # noqa: E402
+from components.metrics import FRONTS  # noqa: E402
+
+HEADER_BASE = ["Carimbo de data/hora", "DATA", "SUPERVISOR", "NOME DO ENCARREGADO", "EQUIPE", "OBSERVAÇÕES"]
+METAS_HEADER = ["Nivel", "Referencia", "Metrica", "Periodo", "Meta", "Prioridade", "Ativo de", "Ativo até"]
+INICIO = dt.date(2024, 1, 1)
+EXCEL_ORIGEM = dt.date(1899, 12, 30)
+LARGURAS = np.array([2.0, 2.5, 3.0, 4.5])
+# Comentario: Valores sujos típicos do formulário (texto, vírgula decimal, unidade, vazio com espaço)
+SUJOS = ("km 12", "12,5", "?", " ", "10+200", "N/A")
+
+
+def team_names(teams: int) -> list[tuple[str, str, str]]:
+    # Comentario: (equipe, encarregado, supervisor); ~4 equipes por supervisor
+    return [(f"EQ{i + 1:03d}", f"ENCARREGADO {i + 1:03d}", f"SUPERVISOR {i // 4 + 1:02d}") for i in range(teams)]
+
+
+def _date_cell(d: dt.date, tipo: int):
+    # Comentario: 0 = datetime do Excel, 1 = dd/mm/aaaa, 2 = ISO, 3 = serial, 4 = inválida
+    if tipo == 0:
+        return dt.datetime(d.year, d.month, d.day)
+    if tipo == 1:
+        return d.strftime("%d/%m/%Y")
+    if tipo == 2:
+        return d.isoformat()
+    if tipo == 3:
+        return (d - EXCEL_ORIGEM).days
+    return "ontem"
+
+
+def iter_rows(rows: int, teams: int = 40, dirty: float = 0.05, mixed_dates: float = 0.3,
+              days: int = 365, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    equipes = team_names(teams)
+    nf = len(FRONTS)
+    dia = np.sort(rng.integers(0, days, rows))
+    equipe = rng.integers(0, teams, rows)
+    # Comentario: Formato da DATA: datetime na maioria; o resto dividido entre texto, serial e lixo (1%)
+    tipo_data = np.where(rng.random(rows) < mixed_dates, rng.choice([1, 2, 3, 4], rows, p=[0.4, 0.3, 0.27, 0.03]), 0)
+    # Comentario: Cada resposta preenche ao menos uma frente (~2 em média)
+    cheia = rng.random((rows, nf)) < 1.5 / nf
+    cheia[np.arange(rows), rng.integers(0, nf, rows)] = True
+    ini = np.round(rng.uniform(0, 300, (rows, nf)), 3)
+    fim = np.round(ini + rng.uniform(0.1, 3.0, (rows, nf)), 3)
+    lar = LARGURAS[rng.integers(0, len(LARGURAS), (rows, nf))]
+    sujo = rng.random((rows, nf)) < dirty
+    tipo_sujo = rng.integers(0, 4, (rows, nf))   # Comentario: 0 texto, 1 KM invertido, 2 largura absurda, 3 KM vazio
+    texto_sujo = rng.integers(0, len(SUJOS), (rows, nf))
+    minuto = rng.integers(6 * 60, 20 * 60, rows)
+
+    for i in range(rows):
+        d = INICIO + dt.timedelta(days=int(dia[i]))
+        eq, enc, sup = equipes[equipe[i]]
+        carimbo = dt.datetime(d.year, d.month, d.day) + dt.timedelta(minutes=int(minuto[i]))
+        row = [carimbo, _date_cell(d, int(tipo_data[i])), sup, enc, eq, None]
+        for j in range(nf):
+            if not cheia[i, j]:
+                row += [None, None, None]
+                continue
+            a, b, w = float(ini[i, j]), float(fim[i, j]), float(lar[i, j])
+            if sujo[i, j]:
+                t = tipo_sujo[i, j]
+                if t == 0:
+                    a = SUJOS[texto_sujo[i, j]]
+                elif t == 1:
+                    a, b = b, a
+                elif t == 2:
+                    w = 80.0
+                else:
+                    b = None
+            row += [a, b, w]
+        yield row
+
+
+def metas_rows(teams: int = 40, days: int = 365, seed: int = 0) -> list[list]:
+    rng = np.random.default_rng(seed + 1)
+    equipes = team_names(teams)
+    fim = INICIO + dt.timedelta(days=days)
+    meio = INICIO + dt.timedelta(days=days // 2)
+    out = [["Geral", "ALL", "m2_total", "Dia", 20000, 99, None, None]]
+    for sup in sorted({s for _, _, s in equipes}):
+        out.append(["Supervisor", sup, "m2_total", "Dia", int(rng.integers(8, 20)) * 1000, 50, None, None])
+    # Comentario: Metade das equipes com meta própria, trocando de valor no meio do período
+    for eq, _, _ in equipes[::2]:
+        m = int(rng.integers(2, 6)) * 1000
+        out.append(["Equipe", eq, "m2_total", "Dia", m, 1, INICIO, meio])
+        out.append(["Equipe", eq, "m2_total", "Dia", m + 500, 1, meio + dt.timedelta(days=1), fim])
+    return out
+
+
+def make_workbook(path: str, rows: int, teams: int = 40, dirty: float = 0.05, mixed_dates: float = 0.3,
+                  days: int = 365, seed: int = 0) -> None:
+    # Comentario: write_only: o gerador não monta o DOM do livro (1M de linhas cabe em memória)
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(DEFAULT_SHEET)
+    ws.append(HEADER_BASE + [c for f in FRONTS for c in f.campos])
+    for row in iter_rows(rows, teams, dirty, mixed_dates, days, seed):
+        ws.append(row)
+    wm = wb.create_sheet("Metas")
+    wm.append(METAS_HEADER)
+    for row in metas_rows(teams, days, seed):
+        wm.append(row)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    wb.save(tmp)
+    os.replace(tmp, path)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--teams", type=int, default=40)
+    ap.add_argument("--dirty", type=float, default=0.05, help="fração de campos KM/largura sujos")
+    ap.add_argument("--mixed-dates", type=float, default=0.3, help="fração de DATA fora do formato datetime")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    make_workbook(args.path, args.rows, args.teams, args.dirty, args.mixed_dates, args.days, args.seed)
+
+
+if __name__ == "__main__":
+    main()